@@ -1,156 +1,359 @@
 """CLI entry point for SelfAI - Planning-First Workflow."""
 import sys
 import os
-import webbrowser
-import subprocess
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple, Optional
 
-from .runner import SelfAIRunner
-from .server import run_server
-from .healers import KnowledgeBase
-from .database import MAX_TEST_ATTEMPTS
+# Package modules (database, runner, server, healers) and heavy stdlib ones
+# (webbrowser, subprocess) are imported inside the commands that need them so
+# that help/install/uninstall and the LaunchAgent tick do not pay for the whole
+# package on startup.
 
+# Invariant for the life of the process
+_PYTHON = sys.executable
+_LAUNCH_AGENTS_DIR = Path('Library', 'LaunchAgents')
+# bootout exit codes meaning the service simply was not loaded
+_LAUNCHCTL_NOT_LOADED = (3, 113)
 
+# (level, display name, status column, test count column) for each level
+_LEVELS = (
+    (1, 'MVP', 'mvp_status', 'mvp_test_count'),
+    (2, 'Enhanced', 'enhanced_status', 'enhanced_test_count'),
+    (3, 'Advanced', 'advanced_status', 'advanced_test_count'),
+)
+
+# Icons for per-level feature status in 'progress' output
+_LEVEL_STATUS_ICONS = {'completed': '✓', 'testing': '🧪', 'approved': '✅', 'pending': '○', 'locked': '🔒'}
+
+
+@lru_cache(maxsize=1)
 def get_repo_root() -> Path:
-    """Get the repository root."""
-    cwd = Path.cwd()
-    if (cwd / 'selfai').exists():
-        return cwd
+    """Get the repository root (resolved once per process)."""
+    cwd = os.getcwd()
+    if os.path.isdir(os.path.join(cwd, 'selfai')):
+        return Path(cwd)
     return Path(__file__).parent.parent.resolve()
 
 
-def install_launchagent():
-    """Install macOS LaunchAgent for scheduled runs."""
-    repo_path = get_repo_root()
-    workspace_path = repo_path / '.selfai_data'
-    (workspace_path / 'logs').mkdir(parents=True, exist_ok=True)
+class _RepoPaths(NamedTuple):
+    """Locations derived from a repository root."""
+    repo: Path
+    data_dir: Path
+    label: str
+    plist: Path
+    dashboard_dirty: Path
+
 
+@lru_cache(maxsize=None)
+def _paths(repo_path: Path) -> _RepoPaths:
+    """Get the data directory and LaunchAgent label/plist for a repository."""
     label = f"com.selfai.{repo_path.name}"
-    plist_path = Path.home() / 'Library' / 'LaunchAgents' / f'{label}.plist'
-    python_path = sys.executable
-
-    plist_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>Label</key>
-    <string>{label}</string>
-    <key>ProgramArguments</key>
-    <array>
-        <string>{python_path}</string>
-        <string>-m</string>
-        <string>selfai</string>
-        <string>run</string>
-    </array>
-    <key>WorkingDirectory</key>
-    <string>{repo_path}</string>
-    <key>StartInterval</key>
-    <integer>180</integer>
-    <key>RunAtLoad</key>
-    <true/>
-    <key>StandardOutPath</key>
-    <string>{workspace_path}/logs/launchd.log</string>
-    <key>StandardErrorPath</key>
-    <string>{workspace_path}/logs/launchd_error.log</string>
-    <key>EnvironmentVariables</key>
-    <dict>
-        <key>PATH</key>
-        <string>/usr/local/bin:/usr/bin:/bin:/opt/homebrew/bin</string>
-        <key>PYTHONPATH</key>
-        <string>{repo_path}</string>
-    </dict>
-</dict>
-</plist>'''
-
-    plist_path.parent.mkdir(parents=True, exist_ok=True)
+    return _RepoPaths(
+        repo=repo_path,
+        data_dir=repo_path / '.selfai_data',
+        label=label,
+        plist=Path.home() / _LAUNCH_AGENTS_DIR / f'{label}.plist',
+        # Same sentinel as SelfAIRunner.dashboard_dirty_file
+        dashboard_dirty=repo_path / '.selfai_data' / '.dashboard_dirty',
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_runner(repo_path: Path) -> 'SelfAIRunner':
+    """Get the runner for a repository, constructed once per process."""
+    from .runner import SelfAIRunner
+    return SelfAIRunner(repo_path)
+
+
+@lru_cache(maxsize=None)
+def _get_db(repo_path: Path) -> 'Database':
+    """Open just the task database, for commands that need nothing else."""
+    from .database import Database
+    return Database(_paths(repo_path).data_dir / 'data' / 'improvements.db')
+
+
+@lru_cache(maxsize=None)
+def _get_log_analyzer(repo_path: Path) -> 'LogAnalyzer':
+    """Construct just the log analyzer, without a runner."""
+    from .runner import LogAnalyzer, CLAUDE_CMD
+    return LogAnalyzer(_paths(repo_path).data_dir, CLAUDE_CMD)
+
+
+# Repositories whose dashboard is stale; rendered once when main() finishes
+# instead of per change
+_dirty_dashboards = set()
+# Set by --no-dashboard: leave rendering to the next dashboard request
+_skip_dashboard = False
+# Set by --defer-dashboard: leave a sentinel for the next run instead of rendering
+_defer_dashboard = False
+
+
+def _mark_dashboard_dirty(repo_path: Path):
+    """Schedule a dashboard refresh for when the command finishes."""
+    _dirty_dashboards.add(repo_path)
+
 
+def _flush_dashboards():
+    """Render every dashboard marked dirty during this process."""
+    if _defer_dashboard:
+        for repo_path in _dirty_dashboards:
+            _paths(repo_path).dashboard_dirty.touch()
+    elif not _skip_dashboard:
+        for repo_path in _dirty_dashboards:
+            try:
+                _get_runner(repo_path).update_dashboard()
+            except Exception as e:
+                print(f"Warning: could not update dashboard: {e}")
+    _dirty_dashboards.clear()
+
+
+@lru_cache(maxsize=1)
+def _launchctl_path() -> str:
+    """Resolve launchctl on PATH once per process."""
+    import shutil
+    return shutil.which('launchctl') or 'launchctl'
+
+
+def _launchctl(*args: str, capture: bool = True) -> 'subprocess.CompletedProcess':
+    """Run a launchctl subcommand without raising.
+
+    Raw output is captured for callers that report it; with `capture` off it
+    is discarded instead, so no pipes are set up. A missing launchctl is
+    reported as exit status 127, like a shell would.
+    """
+    import subprocess
+    stream = subprocess.PIPE if capture else subprocess.DEVNULL
+    command = [_launchctl_path(), *args]
+    try:
+        return subprocess.run(command, stdout=stream, stderr=stream,
+                              bufsize=-1, check=False)
+    except FileNotFoundError:
+        return subprocess.CompletedProcess(command, 127, b'', b'launchctl not found (macOS only)')
+
+
+def _plist_bytes(label: str, repo_str: str, log_dir: str, background: bool = False) -> bytes:
+    """Serialize the LaunchAgent definition as an XML property list.
+
+    By default the job runs with Interactive resource limits, so launchd does
+    not throttle its CPU and I/O; `background` asks for the opposite.
+    """
+    import plistlib
+    plist = {
+        'Label': label,
+        'ProgramArguments': [_PYTHON, '-m', 'selfai', 'run'],
+        'WorkingDirectory': repo_str,
+        'StartInterval': 180,
+        'RunAtLoad': True,
+        'ProcessType': 'Interactive',
+        'StandardOutPath': os.path.join(log_dir, 'launchd.log'),
+        'StandardErrorPath': os.path.join(log_dir, 'launchd_error.log'),
+        'EnvironmentVariables': {
+            'PATH': '/usr/local/bin:/usr/bin:/bin:/opt/homebrew/bin',
+            'PYTHONPATH': repo_str,
+        },
+    }
+    if background:
+        plist['ProcessType'] = 'Background'
+        plist['LowPriorityBackgroundIO'] = True
+        plist['Nice'] = 5
+    # plistlib escapes XML metacharacters in paths that string substitution would not
+    return plistlib.dumps(plist, fmt=plistlib.FMT_XML, sort_keys=False)
+
+
+def _read_plist(plist_file: str) -> Optional[bytes]:
+    """Return the installed plist's bytes, or None if it does not exist."""
     try:
-        subprocess.run(['launchctl', 'unload', str(plist_path)],
-                      capture_output=True, check=False)
-    except Exception:
-        pass
+        with open(plist_file, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _gui_domain() -> str:
+    """Get the launchd domain of the current user's GUI session."""
+    return f'gui/{os.getuid()}'
+
+
+def _bootstrap_agent(plist_file: str) -> 'subprocess.CompletedProcess':
+    """Load an agent into the user's domain, falling back to legacy load."""
+    result = _launchctl('bootstrap', _gui_domain(), plist_file)
+    if result.returncode == 0:
+        return result
+    # Older launchctl without the domain subcommands
+    return _launchctl('load', plist_file)
+
+
+def _bootout_agent(label: str, plist_file: str) -> 'subprocess.CompletedProcess':
+    """Remove an agent from the user's domain, falling back to legacy unload."""
+    # Only the exit status matters here
+    result = _launchctl('bootout', f'{_gui_domain()}/{label}', capture=False)
+    if result.returncode == 0 or result.returncode in _LAUNCHCTL_NOT_LOADED:
+        return result
+    return _launchctl('unload', plist_file, capture=False)
+
+
+def _reload_agent(label: str, plist_file: str) -> 'subprocess.CompletedProcess':
+    """Restart a loaded agent with a single kickstart, falling back to bootout/bootstrap."""
+    result = _launchctl('kickstart', '-k', f'{_gui_domain()}/{label}')
+    if result.returncode == 0:
+        return result
+    _bootout_agent(label, plist_file)
+    return _bootstrap_agent(plist_file)
 
-    plist_path.write_text(plist_content)
-    print(f"Created LaunchAgent: {plist_path}")
 
-    result = subprocess.run(['launchctl', 'load', str(plist_path)],
-                           capture_output=True, text=True)
+def install_launchagent(background: bool = False) -> bool:
+    """Install macOS LaunchAgent for scheduled runs.
+
+    Args:
+        background: Run the job at background priority (throttled CPU and I/O)
+
+    Returns:
+        True if launchd accepted the agent
+    """
+    paths = _paths(get_repo_root())
+    repo_str = os.fspath(paths.repo)
+    log_dir = os.path.join(paths.data_dir, 'logs')
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+
+    label = paths.label
+    plist_path = paths.plist
+
+    plist_bytes = _plist_bytes(label, repo_str, log_dir, background)
+
+    if not os.path.isdir(plist_path.parent):
+        plist_path.parent.mkdir(parents=True, exist_ok=True)
+
+    plist_file = str(plist_path)
+
+    installed = _read_plist(plist_file)
+    if installed == plist_bytes:
+        # Same definition already installed: just restart the job
+        print(f"LaunchAgent up to date: {plist_path}")
+        result = _reload_agent(label, plist_file)
+    else:
+        if installed is not None:
+            # Only an installed plist can have a loaded job to replace
+            _bootout_agent(label, plist_file)
+
+        fd = os.open(plist_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, plist_bytes)
+        finally:
+            os.close(fd)
+        print(f"Created LaunchAgent: {plist_path}")
+
+        result = _bootstrap_agent(plist_file)
 
     if result.returncode == 0:
         print(f"LaunchAgent installed and started!")
         print(f"  - Runs every 3 minutes")
-        print(f"  - Repository: {repo_path}")
-    else:
-        print(f"Failed to load LaunchAgent: {result.stderr}")
+        print(f"  - Repository: {repo_str}")
+        return True
+    print(f"Failed to load LaunchAgent: {result.stderr.decode('utf-8', errors='replace')}")
+    return False
+
+
+def _plist_stat(plist_path: Path) -> Optional[os.stat_result]:
+    """Stat the LaunchAgent plist once: existence and install time together."""
+    try:
+        return os.lstat(plist_path)
+    except FileNotFoundError:
+        return None
 
 
 def uninstall_launchagent():
     """Uninstall the LaunchAgent."""
-    repo_path = get_repo_root()
-    label = f"com.selfai.{repo_path.name}"
-    plist_path = Path.home() / 'Library' / 'LaunchAgents' / f'{label}.plist'
+    paths = _paths(get_repo_root())
+    label = paths.label
+    plist_path = paths.plist
 
-    if plist_path.exists():
-        subprocess.run(['launchctl', 'unload', str(plist_path)],
-                      capture_output=True, check=False)
+    _bootout_agent(label, str(plist_path))
+    try:
         plist_path.unlink()
-        print(f"LaunchAgent uninstalled: {label}")
-    else:
+    except FileNotFoundError:
         print("No LaunchAgent found")
+        return
+    print(f"LaunchAgent uninstalled: {label}")
 
 
 def show_status():
     """Show current status."""
+    from concurrent.futures import ThreadPoolExecutor
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
-    stats = runner.db.get_stats()
-
-    print("\n=== SelfAI Status (Planning-First Workflow) ===")
-    print(f"Repository: {repo_path}")
-
-    print(f"\nTask Status:")
+    db = _get_db(repo_path)
+    plist_path = _paths(repo_path).plist
+
+    # The queries each use their own connection and are independent, so
+    # run them together with the plist stat instead of back to back
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        stats_future = executor.submit(db.get_stats)
+        stuck_future = executor.submit(db.get_stuck_in_progress_tasks, limit=10)
+        review_future = executor.submit(db.get_plan_review_tasks)
+        cancelled_future = executor.submit(db.get_cancelled_tasks)
+        plist_future = executor.submit(_plist_stat, plist_path)
+    stats = stats_future.result()
+    plist_st = plist_future.result()
+    if plist_st is None:
+        agent_status = 'not installed'
+    else:
+        from datetime import datetime
+        installed_at = datetime.fromtimestamp(plist_st.st_mtime).strftime('%Y-%m-%d %H:%M')
+        agent_status = f'installed ({installed_at})'
+
+    # Collect output and write it once instead of one print() per line
+    lines = [
+        "\n=== SelfAI Status (Planning-First Workflow) ===",
+        f"Repository: {repo_path}",
+        f"LaunchAgent: {agent_status}",
+    ]
+
+    lines.append(f"\nTask Status:")
     for status, count in stats.items():
         if count > 0:
-            print(f"  {status}: {count}")
+            lines.append(f"  {status}: {count}")
 
     # Show stuck tasks
-    stuck_tasks = runner.db.get_stuck_in_progress_tasks(limit=10)
+    stuck_tasks = stuck_future.result()
     if stuck_tasks:
-        print(f"\n⚠️  Stuck In-Progress Tasks (may be from crashes):")
+        lines.append(f"\n⚠️  Stuck In-Progress Tasks (may be from crashes):")
         for task in stuck_tasks[:5]:
             started_at = task.get('started_at', 'unknown')
-            print(f"  #{task['id']}: {task['title']}")
-            print(f"      Started: {started_at}")
+            lines.append(f"  #{task['id']}: {task['title']}")
+            lines.append(f"      Started: {started_at}")
         if len(stuck_tasks) > 5:
-            print(f"  ... and {len(stuck_tasks) - 5} more")
-        print(f"\n  Will be resumed on next run")
+            lines.append(f"  ... and {len(stuck_tasks) - 5} more")
+        lines.append(f"\n  Will be resumed on next run")
 
     # Show plan_review tasks that need attention
-    review_tasks = runner.db.get_plan_review_tasks()
+    review_tasks = review_future.result()
     if review_tasks:
-        print(f"\n⚠️  Plans Awaiting Review:")
+        lines.append(f"\n⚠️  Plans Awaiting Review:")
         for task in review_tasks[:5]:
-            print(f"  #{task['id']}: {task['title']}")
+            lines.append(f"  #{task['id']}: {task['title']}")
         if len(review_tasks) > 5:
-            print(f"  ... and {len(review_tasks) - 5} more")
-        print(f"\n  Use: python -m selfai approve <id>")
-        print(f"  Or:  python -m selfai feedback <id> \"your feedback\"")
+            lines.append(f"  ... and {len(review_tasks) - 5} more")
+        lines.append(f"\n  Use: python -m selfai approve <id>")
+        lines.append(f"  Or:  python -m selfai feedback <id> \"your feedback\"")
 
     # Show cancelled tasks
-    cancelled = runner.db.get_cancelled_tasks()
+    cancelled = cancelled_future.result()
     if cancelled:
-        print(f"\n❌ Cancelled Tasks (need feedback):")
+        lines.append(f"\n❌ Cancelled Tasks (need feedback):")
         for task in cancelled[:3]:
-            print(f"  #{task['id']}: {task['title']}")
-        print(f"\n  Use: python -m selfai reenable <id> [\"feedback\"]")
+            lines.append(f"  #{task['id']}: {task['title']}")
+        lines.append(f"\n  Use: python -m selfai reenable <id> [\"feedback\"]")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def show_stuck_tasks():
     """Show tasks that may be stuck from crashed processes."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    stuck_tasks = runner.db.get_stuck_in_progress_tasks(limit=10)
+    stuck_tasks = db.get_stuck_in_progress_tasks(limit=10)
 
     if not stuck_tasks:
         print("\nNo stuck tasks found")
@@ -168,46 +371,35 @@ def show_stuck_tasks():
 
 def open_dashboard():
     """Open the dashboard in browser via server."""
-    import threading
-    import time
     from http.server import HTTPServer
+    import webbrowser
     from .server import create_handler
 
     repo_path = get_repo_root()
 
-    # Update dashboard first
-    runner = SelfAIRunner(repo_path)
-    runner.update_dashboard()
-
-    # Start server in background thread
+    # The server renders the dashboard on the first page load, and the
+    # constructor already binds and listens, so the browser's request
+    # simply waits in the backlog until serve_forever() picks it up
     handler = create_handler(repo_path)
     server = HTTPServer(('localhost', 8787), handler)
 
-    def serve():
-        server.serve_forever()
-
-    thread = threading.Thread(target=serve, daemon=True)
-    thread.start()
-
-    # Give server time to start
-    time.sleep(0.5)
-
     # Open browser
     webbrowser.open('http://localhost:8787/')
     print(f"Dashboard opened at http://localhost:8787/")
     print("Press Ctrl+C to stop")
 
     try:
-        # Keep main thread alive
-        while True:
-            time.sleep(1)
+        server.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped")
-        server.shutdown()
+    finally:
+        server.server_close()
 
 
 def serve_dashboard(port: int = 8787):
     """Start the dashboard server."""
+    from .server import run_server
+
     repo_path = get_repo_root()
     print(f"Starting SelfAI Dashboard Server for: {repo_path}")
     run_server(host='localhost', port=port, repo_path=repo_path)
@@ -218,12 +410,17 @@ def run_once(discover: bool = False):
     repo_path = get_repo_root()
     print(f"Running SelfAI for: {repo_path}")
 
-    runner = SelfAIRunner(repo_path)
-    runner.run(discover=discover)
+    runner = _get_runner(repo_path)
+    try:
+        runner.run(discover=discover)
+    finally:
+        runner.close()
 
     stats = runner.db.get_stats()
-    print(f"\nStatus: {stats.get('completed', 0)} completed, {stats.get('in_progress', 0)} in progress")
-    print(f"        {stats.get('plan_review', 0)} awaiting review, {stats.get('pending', 0)} pending")
+    sys.stdout.write(
+        f"\nStatus: {stats.get('completed', 0)} completed, {stats.get('in_progress', 0)} in progress\n"
+        f"        {stats.get('plan_review', 0)} awaiting review, {stats.get('pending', 0)} pending\n"
+    )
 
 
 def run_discovery(categories: list = None):
@@ -231,7 +428,7 @@ def run_discovery(categories: list = None):
     from .discovery import DiscoveryCategory
 
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    runner = _get_runner(repo_path)
 
     print("\n🔍 Discovering improvements...")
     if categories:
@@ -241,7 +438,7 @@ def run_discovery(categories: list = None):
 
     discovered = runner._discover_existing_features(categories)
 
-    runner.update_dashboard()
+    _mark_dashboard_dirty(repo_path)
     print(f"\n✅ Found {discovered} new improvements")
     print("Run 'python -m selfai status' to see pending tasks")
 
@@ -249,25 +446,27 @@ def run_discovery(categories: list = None):
 def add_improvement(title: str, description: str = ''):
     """Add a new improvement task."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    imp_id = runner.db.add(
+    imp_id = db.add(
         title=title,
         description=description,
         source='manual'
     )
 
-    runner.update_dashboard()
-    print(f"Added task #{imp_id}: {title}")
-    print("  Status: pending (will be planned on next run)")
+    _mark_dashboard_dirty(repo_path)
+    sys.stdout.write(
+        f"Added task #{imp_id}: {title}\n"
+        "  Status: pending (will be planned on next run)\n"
+    )
 
 
 def approve_plan(task_id: int):
     """Approve a plan for execution."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    task = runner.db.get_by_id(task_id)
+    task = db.get_summary(task_id)
     if not task:
         print(f"Error: Task #{task_id} not found")
         return
@@ -276,8 +475,8 @@ def approve_plan(task_id: int):
         print(f"Error: Task #{task_id} is not awaiting review (status: {task['status']})")
         return
 
-    runner.db.approve_plan(task_id)
-    runner.update_dashboard()
+    db.approve_plan(task_id)
+    _mark_dashboard_dirty(repo_path)
     print(f"✅ Approved plan for #{task_id}: {task['title']}")
     print("  Will be executed on next run")
 
@@ -285,9 +484,9 @@ def approve_plan(task_id: int):
 def provide_feedback(task_id: int, feedback: str):
     """Provide feedback on a plan."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    task = runner.db.get_by_id(task_id)
+    task = db.get_summary(task_id)
     if not task:
         print(f"Error: Task #{task_id} not found")
         return
@@ -296,8 +495,8 @@ def provide_feedback(task_id: int, feedback: str):
         print(f"Error: Task #{task_id} is not awaiting review (status: {task['status']})")
         return
 
-    runner.db.request_plan_feedback(task_id, feedback)
-    runner.update_dashboard()
+    db.request_plan_feedback(task_id, feedback)
+    _mark_dashboard_dirty(repo_path)
     print(f"📝 Feedback submitted for #{task_id}")
     print("  Plan will be revised on next run")
 
@@ -305,9 +504,9 @@ def provide_feedback(task_id: int, feedback: str):
 def reenable_task(task_id: int, feedback: str = ''):
     """Re-enable a cancelled task."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    task = runner.db.get_by_id(task_id)
+    task = db.get_summary(task_id)
     if not task:
         print(f"Error: Task #{task_id} not found")
         return
@@ -316,8 +515,8 @@ def reenable_task(task_id: int, feedback: str = ''):
         print(f"Error: Task #{task_id} is not cancelled (status: {task['status']})")
         return
 
-    runner.db.re_enable_cancelled(task_id, feedback)
-    runner.update_dashboard()
+    db.re_enable_cancelled(task_id, feedback)
+    _mark_dashboard_dirty(repo_path)
     print(f"🔄 Re-enabled task #{task_id}: {task['title']}")
     print("  Will be re-planned on next run")
 
@@ -325,9 +524,9 @@ def reenable_task(task_id: int, feedback: str = ''):
 def show_plan(task_id: int):
     """Show the plan for a task."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    task = runner.db.get_by_id(task_id)
+    task = db.get_by_id(task_id)
     if not task:
         print(f"Error: Task #{task_id} not found")
         return
@@ -349,42 +548,44 @@ def show_plan(task_id: int):
 
 def analyze_logs():
     """Analyze logs for errors and issues."""
-    from .runner import LogAnalyzer, CLAUDE_CMD
     repo_path = get_repo_root()
-    data_dir = repo_path / '.selfai_data'
 
-    analyzer = LogAnalyzer(data_dir, CLAUDE_CMD)
+    analyzer = _get_log_analyzer(repo_path)
     analysis = analyzer.analyze_logs()
 
-    print(f"\n=== Log Analysis ===")
-    print(f"Analyzed {analysis['log_lines']} log lines")
-    print(f"Found {analysis['issues_found']} issues\n")
+    # Collect output and write it once instead of one print() per line
+    lines = [
+        "\n=== Log Analysis ===",
+        f"Analyzed {analysis['log_lines']} log lines",
+        f"Found {analysis['issues_found']} issues\n",
+    ]
 
     if analysis['issues']:
-        print("Issues:")
-        print("-" * 70)
+        lines.append("Issues:")
+        lines.append("-" * 70)
         for i, issue in enumerate(analysis['issues'][:10], 1):
             issue_type = issue['type'].upper()
-            detail = issue['detail'][:60]
-            print(f"  {i}. [{issue_type}] {detail}")
-            if len(issue['detail']) > 60:
-                print(f"     {'...'}")
+            detail = issue['detail']
+            lines.append(f"  {i}. [{issue_type}] {detail[:60]}")
+            if detail[60:61]:
+                lines.append("     ...")
 
         if len(analysis['issues']) > 10:
-            print(f"\n... and {len(analysis['issues']) - 10} more issues")
+            lines.append(f"\n... and {len(analysis['issues']) - 10} more issues")
 
-        print("\nUse 'python -m selfai diagnose' to run diagnosis on these issues")
+        lines.append("\nUse 'python -m selfai diagnose' to run diagnosis on these issues")
     else:
-        print("No issues found in logs.")
+        lines.append("No issues found in logs.")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def diagnose_issues():
     """Diagnose issues found in logs."""
-    from .runner import LogAnalyzer, CLAUDE_CMD
+    from concurrent.futures import ThreadPoolExecutor
     repo_path = get_repo_root()
-    data_dir = repo_path / '.selfai_data'
 
-    analyzer = LogAnalyzer(data_dir, CLAUDE_CMD)
+    analyzer = _get_log_analyzer(repo_path)
     analysis = analyzer.analyze_logs()
 
     if not analysis['issues']:
@@ -393,10 +594,16 @@ def diagnose_issues():
 
     print(f"\n=== Diagnosing {len(analysis['issues'])} issues ===\n")
 
-    for i, issue in enumerate(analysis['issues'][:3], 1):
+    # Each diagnosis is an independent Claude round-trip: run them together,
+    # then report in the original order
+    issues = analysis['issues'][:3]
+    with ThreadPoolExecutor(max_workers=len(issues)) as executor:
+        futures = [executor.submit(analyzer.diagnose_and_fix, issue, repo_path) for issue in issues]
+
+    for i, (issue, future) in enumerate(zip(issues, futures), 1):
         print(f"{i}. Diagnosing [{issue['type'].upper()}]: {issue['detail'][:50]}...")
         try:
-            diagnosis = analyzer.diagnose_and_fix(issue, repo_path)
+            diagnosis = future.result()
             print(f"   Diagnosis: {diagnosis.get('diagnosis', 'N/A')[:80]}")
             print(f"   Confidence: {diagnosis.get('confidence', 0):.2f}")
             if diagnosis.get('fix_description'):
@@ -411,10 +618,9 @@ def diagnose_issues():
 
 def show_monitoring_stats():
     """Show monitoring and self-healing statistics."""
-    import sqlite3
+    from .healers import KnowledgeBase
     repo_path = get_repo_root()
-    data_dir = repo_path / '.selfai_data'
-    healing_db_path = data_dir / 'healing.db'
+    healing_db_path = _paths(repo_path).data_dir / 'healing.db'
 
     if not healing_db_path.exists():
         print("\nNo monitoring data available yet.")
@@ -450,22 +656,15 @@ def show_monitoring_stats():
 
     # Get recent history
     try:
-        with sqlite3.connect(str(healing_db_path), timeout=30.0) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT error_type, success, timestamp, diagnosis
-                FROM healing_history
-                ORDER BY timestamp DESC LIMIT 10
-            ''')
-            recent = [dict(row) for row in cursor.fetchall()]
+        # Reuses the knowledge base's connection instead of opening another
+        recent = kb.get_recent_history(limit=10)
 
         if recent:
-            for record in recent:
-                status = "✅" if record['success'] else "❌"
-                timestamp = record['timestamp'][:19]  # Remove microseconds
-                print(f"{status} {timestamp} - {record['error_type']}")
-                if not record['success']:
-                    print(f"   Diagnosis: {record['diagnosis'][:60]}...")
+            for row in recent:
+                status = "✅" if row['success'] else "❌"
+                print(f"{status} {row['timestamp'][:19]} - {row['error_type']}")  # Remove microseconds
+                if not row['success']:
+                    print(f"   Diagnosis: {row['diagnosis'][:60]}...")
         else:
             print("No recent healing attempts.")
     except Exception as e:
@@ -477,46 +676,49 @@ def show_monitoring_stats():
 def show_levels():
     """Show level unlock status."""
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
+    db = _get_db(repo_path)
 
-    print("\n=== Level Progression Status ===")
+    lines = ["\n=== Level Progression Status ==="]
 
-    for level in [1, 2, 3]:
-        unlocked, msg = runner.db.is_level_unlocked(level)
-        name = ['MVP', 'Enhanced', 'Advanced'][level-1]
+    for level, name, _, _ in _LEVELS:
+        unlocked, msg = db.is_level_unlocked(level)
         icon = '✓' if unlocked else '✗'
-        print(f"  {icon} Level {level} ({name}): {msg}")
+        lines.append(f"  {icon} Level {level} ({name}): {msg}")
 
-    print("\n=== Features by Level ===")
-    stats = runner.db.get_stats_by_level()
+    lines.append("\n=== Features by Level ===")
+    stats = db.get_stats_by_level()
     for level_name, counts in stats.items():
-        print(f"  {level_name}: {counts['completed']} complete, {counts['in_progress']} in progress, {counts['pending']} pending")
+        lines.append(f"  {level_name}: {counts['completed']} complete, {counts['in_progress']} in progress, {counts['pending']} pending")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def show_feature_progress(task_id: int):
     """Show detailed level progress for a feature."""
+    from .database import MAX_TEST_ATTEMPTS
     repo_path = get_repo_root()
-    runner = SelfAIRunner(repo_path)
-    task = runner.db.get_by_id(task_id)
+    db = _get_db(repo_path)
+    task = db.get_by_id(task_id)
 
     if not task:
         print(f"Error: Task #{task_id} not found")
         return
 
-    print(f"\n=== Feature #{task_id}: {task['title']} ===")
-    print(f"Current Level: {task.get('current_level', 1)}/3")
+    lines = [
+        f"\n=== Feature #{task_id}: {task['title']} ===",
+        f"Current Level: {task.get('current_level', 1)}/3",
+    ]
 
-    for level, name in [(1, 'MVP'), (2, 'Enhanced'), (3, 'Advanced')]:
-        status = task.get(f'{name.lower()}_status', 'locked')
-        test_count = task.get(f'{name.lower()}_test_count', 0)
-        icon_map = {'completed': '✓', 'testing': '🧪', 'approved': '✅', 'pending': '○', 'locked': '🔒'}
-        icon = icon_map.get(status, '?')
-        print(f"  {icon} {name}: {status} (tests: {test_count}/{MAX_TEST_ATTEMPTS})")
+    for _, name, status_col, test_count_col in _LEVELS:
+        status = task.get(status_col) or 'locked'
+        test_count = task.get(test_count_col) or 0
+        icon = _LEVEL_STATUS_ICONS.get(status, '?')
+        lines.append(f"  {icon} {name}: {status} (tests: {test_count}/{MAX_TEST_ATTEMPTS})")
 
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def print_help():
-    """Print usage help."""
-    print("""
+
+_HELP_TEXT = """
 SelfAI - Planning-First Autonomous Improvement System
 
 Usage:
@@ -538,10 +740,18 @@ Commands:
     feedback <id> "msg"  Provide feedback to revise a plan
     reenable <id>    Re-enable a cancelled task
     plan <id>        View the full plan for a task
-    install          Install LaunchAgent (runs every 3 minutes)
+    install [--background]  Install LaunchAgent (runs every 3 minutes;
+                     --background runs it at low CPU/IO priority)
     uninstall        Remove LaunchAgent
     help             Show this help
 
+Options:
+    --no-dashboard   Don't re-render the dashboard after add/approve/feedback/
+                     reenable/discover (the next page load refreshes it)
+    --defer-dashboard  Like --no-dashboard, but record that a refresh is due so
+                     the next 'run' re-renders it even if it has no work (for
+                     bulk adds)
+
 Workflow:
     1. Tasks start as 'pending'
     2. Plans are generated with internet research
@@ -562,108 +772,175 @@ Examples:
     python -m selfai reenable 3              # Re-enable cancelled task
     python -m selfai plan 5                  # View plan for task #5
     python -m selfai dashboard               # Open dashboard
-""")
+    python -m selfai approve 5 --no-dashboard  # Approve without re-rendering
+    python -m selfai add "Task" --defer-dashboard  # Bulk add; next run re-renders
 
+"""
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print_help()
-        return
 
-    command = sys.argv[1].lower()
+def print_help():
+    """Print usage help."""
+    sys.stdout.write(_HELP_TEXT)
 
-    if command == 'install':
-        install_launchagent()
-    elif command == 'uninstall':
+
+def _parse_task_id(value: str):
+    """Parse a task id argument, printing an error when it is not a number."""
+    try:
+        return int(value)
+    except ValueError:
+        print("Error: task_id must be a number")
+        return None
+
+
+def _requires_macos() -> bool:
+    """Print an error and return False when not running on macOS."""
+    if sys.platform == 'darwin':
+        return True
+    print("Error: LaunchAgents require macOS (launchd); use 'python -m selfai run' "
+          "from cron or another scheduler instead")
+    return False
+
+
+def _cmd_install(args: list):
+    if _requires_macos():
+        install_launchagent(background='--background' in args)
+
+
+def _cmd_uninstall(args: list):
+    if _requires_macos():
         uninstall_launchagent()
-    elif command == 'run':
-        # Check for --discover flag
-        discover = '--discover' in sys.argv
-        run_once(discover=discover)
-    elif command == 'discover':
-        # Get optional categories from remaining args
-        categories = sys.argv[2:] if len(sys.argv) > 2 else None
-        if categories:
-            # Validate categories
-            valid_cats = ['security', 'test_coverage', 'refactoring', 'documentation', 'performance', 'code_quality']
-            invalid = [c for c in categories if c not in valid_cats]
-            if invalid:
-                print(f"Error: Invalid categories: {', '.join(invalid)}")
-                print(f"Valid categories: {', '.join(valid_cats)}")
-                return
-        run_discovery(categories)
-    elif command == 'status':
-        show_status()
-    elif command == 'stuck':
-        show_stuck_tasks()
-    elif command == 'dashboard':
-        open_dashboard()
-    elif command == 'serve':
-        port = 8787
-        if len(sys.argv) > 2:
-            try:
-                port = int(sys.argv[2])
-            except ValueError:
-                print("Error: port must be a number")
-                return
-        serve_dashboard(port)
-    elif command == 'add':
-        if len(sys.argv) < 3:
-            print("Usage: python -m selfai add \"title\" [description]")
-            return
-        title = sys.argv[2]
-        description = sys.argv[3] if len(sys.argv) > 3 else ''
-        add_improvement(title, description)
-    elif command == 'approve':
-        if len(sys.argv) < 3:
-            print("Usage: python -m selfai approve <task_id>")
-            return
-        try:
-            task_id = int(sys.argv[2])
-            approve_plan(task_id)
-        except ValueError:
-            print("Error: task_id must be a number")
-    elif command == 'feedback':
-        if len(sys.argv) < 4:
-            print('Usage: python -m selfai feedback <task_id> "feedback message"')
-            return
-        try:
-            task_id = int(sys.argv[2])
-            feedback = sys.argv[3]
-            provide_feedback(task_id, feedback)
-        except ValueError:
-            print("Error: task_id must be a number")
-    elif command == 'reenable':
-        if len(sys.argv) < 3:
-            print('Usage: python -m selfai reenable <task_id> ["optional feedback"]')
+
+
+def _cmd_run(args: list):
+    run_once(discover='--discover' in args)
+
+
+def _cmd_discover(args: list):
+    # Optional categories from remaining args
+    categories = args or None
+    if categories:
+        valid_cats = ['security', 'test_coverage', 'refactoring', 'documentation', 'performance', 'code_quality']
+        invalid = [c for c in categories if c not in valid_cats]
+        if invalid:
+            print(f"Error: Invalid categories: {', '.join(invalid)}")
+            print(f"Valid categories: {', '.join(valid_cats)}")
             return
+    run_discovery(categories)
+
+
+def _cmd_serve(args: list):
+    port = 8787
+    if args:
         try:
-            task_id = int(sys.argv[2])
-            feedback = sys.argv[3] if len(sys.argv) > 3 else ''
-            reenable_task(task_id, feedback)
+            port = int(args[0])
         except ValueError:
-            print("Error: task_id must be a number")
-    elif command == 'plan':
-        if len(sys.argv) < 3:
-            print("Usage: python -m selfai plan <task_id>")
+            print("Error: port must be a number")
             return
-        try:
-            task_id = int(sys.argv[2])
-            show_plan(task_id)
-        except ValueError:
-            print("Error: task_id must be a number")
-    elif command == 'monitor':
-        show_monitoring_stats()
-    elif command == 'analyze-logs':
-        analyze_logs()
-    elif command == 'diagnose':
-        diagnose_issues()
-    elif command in ('help', '-h', '--help'):
-        print_help()
-    else:
-        print(f"Unknown command: {command}")
+    serve_dashboard(port)
+
+
+def _cmd_add(args: list):
+    if not args:
+        print("Usage: python -m selfai add \"title\" [description]")
+        return
+    add_improvement(args[0], args[1] if len(args) > 1 else '')
+
+
+def _cmd_approve(args: list):
+    if not args:
+        print("Usage: python -m selfai approve <task_id>")
+        return
+    task_id = _parse_task_id(args[0])
+    if task_id is not None:
+        approve_plan(task_id)
+
+
+def _cmd_feedback(args: list):
+    if len(args) < 2:
+        print('Usage: python -m selfai feedback <task_id> "feedback message"')
+        return
+    task_id = _parse_task_id(args[0])
+    if task_id is not None:
+        provide_feedback(task_id, args[1])
+
+
+def _cmd_reenable(args: list):
+    if not args:
+        print('Usage: python -m selfai reenable <task_id> ["optional feedback"]')
+        return
+    task_id = _parse_task_id(args[0])
+    if task_id is not None:
+        reenable_task(task_id, args[1] if len(args) > 1 else '')
+
+
+def _cmd_plan(args: list):
+    if not args:
+        print("Usage: python -m selfai plan <task_id>")
+        return
+    task_id = _parse_task_id(args[0])
+    if task_id is not None:
+        show_plan(task_id)
+
+
+# Command dispatch table; every handler receives the arguments after the command
+COMMANDS = {
+    'install': _cmd_install,
+    'uninstall': _cmd_uninstall,
+    'status': lambda args: show_status(),
+    'stuck': lambda args: show_stuck_tasks(),
+    'dashboard': lambda args: open_dashboard(),
+    'monitor': lambda args: show_monitoring_stats(),
+    'analyze-logs': lambda args: analyze_logs(),
+    'diagnose': lambda args: diagnose_issues(),
+    'help': lambda args: print_help(),
+    '-h': lambda args: print_help(),
+    '--help': lambda args: print_help(),
+    'run': _cmd_run,
+    'discover': _cmd_discover,
+    'serve': _cmd_serve,
+    'add': _cmd_add,
+    'approve': _cmd_approve,
+    'feedback': _cmd_feedback,
+    'reenable': _cmd_reenable,
+    'plan': _cmd_plan,
+}
+
+
+# Options accepted anywhere on the command line, for every command
+_GLOBAL_OPTIONS = frozenset({'--no-dashboard', '--defer-dashboard'})
+
+
+def main():
+    """Main entry point."""
+    global _skip_dashboard, _defer_dashboard
+    # Split global options from the command and its arguments in one pass
+    argv = []
+    options = set()
+    for arg in sys.argv[1:]:
+        if arg in _GLOBAL_OPTIONS:
+            options.add(arg)
+        else:
+            argv.append(arg)
+    _skip_dashboard = '--no-dashboard' in options
+    _defer_dashboard = '--defer-dashboard' in options
+
+    if not argv:
         print_help()
+        return
+
+    command = argv[0].lower()
+
+    handler = COMMANDS.get(command)
+    if handler is not None:
+        # Flushed here rather than from atexit: rendering imports the runner,
+        # and imports during interpreter shutdown fail
+        try:
+            handler(argv[1:])
+        finally:
+            _flush_dashboards()
+        return
+
+    sys.stdout.write(f"Unknown command: {command}\n{_HELP_TEXT}")
 
 
 if __name__ == '__main__':
@@ -4,8 +4,9 @@ import json
 import threading
 from contextlib import contextmanager
 from datetime import datetime
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger('selfai')
@@ -16,6 +17,125 @@ MAX_TEST_ATTEMPTS = 3
 # Maximum parallel tasks
 MAX_PARALLEL_TASKS = 3
 
+# Stored in PRAGMA user_version once _init_db's migrations have run; bump it
+# whenever a migration is added
+SCHEMA_VERSION = 1
+
+# One pass over the table for get_stats_by_level: completed, in-progress and
+# pending counts for each level, in this order
+_STATS_LEVELS = (('MVP', 1), ('Enhanced', 2), ('Advanced', 3))
+_STATS_BY_LEVEL_SQL = 'SELECT ' + ', '.join(
+    f"COUNT(CASE WHEN {name.lower()}_status = 'completed' THEN 1 END), "
+    f"COUNT(CASE WHEN {name.lower()}_status IN ('testing', 'approved') THEN 1 END), "
+    f"COUNT(CASE WHEN {name.lower()}_status = 'pending' AND current_level = {num} THEN 1 END)"
+    for name, num in _STATS_LEVELS
+) + ' FROM improvements'
+
+# Per-level statements, keyed by level number and built once so that the
+# pooled connection's statement cache sees the same SQL text on every call
+_LEVEL_PREFIXES = {1: 'mvp', 2: 'enhanced', 3: 'advanced'}
+
+# save_plan and mark_testing pick the level column from the row's own
+# current_level, so neither needs to read it first
+_SAVE_PLAN_SQL = '''
+    UPDATE improvements
+    SET plan_content = ?, plan_status = 'approved', status = 'approved',
+        optimized_plan = ?,
+        mvp_status = CASE WHEN current_level IN (2, 3) THEN mvp_status ELSE 'approved' END,
+        enhanced_status = CASE WHEN current_level = 2 THEN 'approved' ELSE enhanced_status END,
+        advanced_status = CASE WHEN current_level = 3 THEN 'approved' ELSE advanced_status END
+    WHERE id = ?
+'''
+
+_MARK_TESTING_SQL = '''
+    UPDATE improvements
+    SET status = 'testing', output = ?,
+        mvp_status = CASE WHEN current_level = 1 THEN 'testing' ELSE mvp_status END,
+        enhanced_status = CASE WHEN current_level = 2 THEN 'testing' ELSE enhanced_status END,
+        advanced_status = CASE WHEN current_level = 3 THEN 'testing' ELSE advanced_status END
+    WHERE id = ?
+'''
+
+# Passing at a level completes it and every level below it
+_MARK_TEST_PASSED_SQL = {
+    level: '''
+        UPDATE improvements
+        SET status = 'completed', test_output = ?, completed_at = ?%s
+        WHERE id = ?
+    ''' % ''.join(", %s_status = 'completed'" % _LEVEL_PREFIXES[done] for done in range(1, level + 1))
+    for level in range(4)
+}
+
+_ADVANCE_LEVEL_SQL = {
+    level: f'''
+        UPDATE improvements
+        SET current_level = ?, {prefix}_status = 'pending'
+        WHERE id = ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items() if level > 1
+}
+
+_MARK_LEVEL_COMPLETED_SQL = {
+    level: f'''
+        UPDATE improvements SET {prefix}_status = 'testing', {prefix}_output = ?
+        WHERE id = ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items()
+}
+
+_MARK_LEVEL_PASSED_SQL = {
+    level: f'''
+        UPDATE improvements SET {prefix}_status = 'completed', {prefix}_test_output = ?
+        WHERE id = ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items()
+}
+
+_FEATURES_FOR_LEVEL_SQL = {
+    level: f'''
+        SELECT * FROM improvements
+        WHERE current_level = ? AND {prefix}_status = 'approved'
+        AND status = 'approved'
+        ORDER BY priority DESC
+        LIMIT ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items()
+}
+
+_PENDING_PLANNING_FOR_LEVEL_SQL = {
+    level: f'''
+        SELECT * FROM improvements
+        WHERE current_level = ? AND {prefix}_status = 'pending'
+        AND status != 'cancelled'
+        ORDER BY priority DESC, created_at ASC
+        LIMIT ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items()
+}
+
+_TESTING_AT_LEVEL_SQL = {
+    level: f'''
+        SELECT * FROM improvements
+        WHERE current_level = ? AND {prefix}_status = 'testing'
+        AND {prefix}_test_count < ?
+        AND status != 'cancelled'
+        ORDER BY priority DESC
+        LIMIT ?
+    '''
+    for level, prefix in _LEVEL_PREFIXES.items()
+}
+
+# Applied to every connection: in WAL mode NORMAL syncs at checkpoints rather
+# than on every commit, temporary tables/indices stay in memory, up to 256 MiB
+# of the file is memory-mapped and up to ~20 MB of pages cached by SQLite.
+# journal_mode=WAL is persistent, so _init_db sets it once.
+_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+)
+
 # Status flow:
 # pending -> planning -> plan_review -> approved -> in_progress -> testing -> completed
 #                           |                                         |
@@ -46,6 +166,9 @@ class Database:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # SQLite connections can't be shared across threads, so each thread
+        # keeps its own, opened on first use (see _conn)
+        self._local = threading.local()
         self._init_db()
 
     @classmethod
@@ -79,6 +202,7 @@ class Database:
             if env_id in cls._instances:
                 db = cls._instances[env_id]
                 # Close connections and cleanup
+                db.close()
                 try:
                     if db.db_path.exists():
                         db.db_path.unlink()
@@ -94,10 +218,9 @@ class Database:
     def _init_db(self):
         """Initialize database schema for planning workflow."""
         # Use longer timeout and WAL mode for better concurrency
-        with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
-            # Enable WAL mode for better concurrency
+        with self._connect(timeout=30.0) as conn:
+            # Enable WAL mode for better concurrency (stored in the database file)
             conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA busy_timeout=30000')  # 30 seconds
             # Create new simplified table
             conn.execute('''
             CREATE TABLE IF NOT EXISTS improvements (
@@ -172,13 +295,29 @@ class Database:
                 'ALTER TABLE improvements ADD COLUMN diagnostic_confidence REAL DEFAULT 0.0',
             ]
 
-            for migration in migrations:
-                try:
-                    conn.execute(migration)
-                except sqlite3.OperationalError:
-                    pass  # Column already exists
-
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_status ON improvements(status)')
+            # Only databases older than SCHEMA_VERSION (including every fresh
+            # one, since CREATE TABLE above predates most of these) run them
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                for migration in migrations:
+                    try:
+                        conn.execute(migration)
+                    except sqlite3.OperationalError:
+                        pass  # Column already exists
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+            # Queue lookups filter on status and read rows in scheduling order
+            # straight from these; idx_queue also covers plain status filters
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_queue ON improvements(status, priority DESC, created_at ASC)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_started ON improvements(status, started_at)')
+            conn.execute('DROP INDEX IF EXISTS idx_status')
+            # Partial indexes holding only completed levels, walked by the
+            # unlock counts in check_and_unlock_levels
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_mvp_completed ON improvements(id) WHERE mvp_status = 'completed'")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_enhanced_completed ON improvements(id) WHERE enhanced_status = 'completed'")
+            # Exact-title probe in exists(); not UNIQUE since older databases
+            # may already hold duplicate titles
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_title ON improvements(title)')
+            # Full-table listings ordered by priority (get_all, dashboard)
             conn.execute('CREATE INDEX IF NOT EXISTS idx_priority ON improvements(priority)')
 
             # Create level_unlocks table for global unlock tracking
@@ -197,12 +336,62 @@ class Database:
 
             conn.commit()
 
+    def _connect(self, timeout: float = 5.0) -> sqlite3.Connection:
+        """Open a connection with the module's tuning PRAGMAs applied.
+
+        Reads go through a memory map, so pages are served from the OS page
+        cache, which stays warm between the LaunchAgent's runs.
+
+        Args:
+            timeout: Seconds to wait for a lock held by another connection
+        """
+        conn = sqlite3.connect(self.db_path, timeout=timeout, cached_statements=256)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, opening it on first use.
+
+        Use it as ``with self._conn() as conn:`` - the block commits or rolls
+        back but leaves the connection open for the next call.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        else:
+            # Methods opt in to sqlite3.Row per call; don't leak it to the next
+            conn.row_factory = None
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """Run a read-then-write method in a BEGIN IMMEDIATE transaction.
+
+        Taking the write lock up front means the method's reads and writes see
+        one snapshot, and a concurrent writer makes it wait in the busy
+        handler instead of failing with SQLITE_BUSY when upgrading a read
+        transaction. WAL readers are not blocked either way.
+        """
+        conn = self._conn()
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        with conn:
+            yield conn
+
+    def close(self):
+        """Close the calling thread's pooled connection, if it has one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
     @contextmanager
     def get_connection(self):
         """Context manager for database connections with proper cleanup."""
-        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn = self._connect(timeout=30.0)
         try:
-            conn.execute('PRAGMA journal_mode=WAL')
             yield conn
             conn.commit()
         except Exception:
@@ -214,7 +403,7 @@ class Database:
     def add(self, title: str, description: str, category: str = 'general',
             priority: int = 50, source: str = 'ai_discovered') -> int:
         """Add a new improvement."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.execute('''
                 INSERT INTO improvements (title, description, category, priority, source, created_at, status)
                 VALUES (?, ?, ?, ?, ?, ?, 'pending')
@@ -225,22 +414,56 @@ class Database:
 
     def get_by_id(self, imp_id: int) -> Optional[Dict]:
         """Get a single improvement by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('SELECT * FROM improvements WHERE id = ?', (imp_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_summary(self, imp_id: int) -> Optional[Dict]:
+        """Get just the id, title and status of an improvement.
+
+        Enough to check whether a task can move to its next state without
+        loading its plan and captured output columns.
+        """
+        with self._conn() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('SELECT id, title, status FROM improvements WHERE id = ?', (imp_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
     def get_all(self) -> List[Dict]:
         """Get all improvements."""
-        with sqlite3.connect(self.db_path) as conn:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Dict]:
+        """Yield all improvements one at a time, in get_all() order."""
+        cursor = self._conn().cursor()
+        # Set on the cursor, not the shared connection, so other calls made
+        # while this generator is suspended are unaffected
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('SELECT * FROM improvements ORDER BY priority DESC, id DESC')
+        for row in cursor:
+            yield dict(row)
+
+    def get_dashboard_tasks(self) -> List[Dict]:
+        """Get all improvements with only the columns the dashboard renders.
+
+        The output and test output columns are left out: they can hold
+        megabytes of captured output per task that the page never shows.
+        """
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute('SELECT * FROM improvements ORDER BY priority DESC, id DESC')
+            cursor = conn.execute('''
+                SELECT id, title, status, plan_content, optimized_plan,
+                       branch_name, merge_conflicts, test_count
+                FROM improvements ORDER BY priority DESC, id DESC
+            ''')
             return [dict(row) for row in cursor.fetchall()]
 
     def get_pending_planning(self, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get tasks that need planning."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -252,7 +475,7 @@ class Database:
 
     def get_approved_tasks(self, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get tasks that are approved and ready for execution."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -264,7 +487,7 @@ class Database:
 
     def get_tasks_for_testing(self, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get tasks that need testing (only tasks that were implemented)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -278,7 +501,7 @@ class Database:
 
     def get_in_progress(self, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get tasks currently in progress."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -294,7 +517,7 @@ class Database:
         These are tasks marked as in_progress but no active runner is processing them.
         Order by started_at ASC to process oldest stuck tasks first.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -306,7 +529,7 @@ class Database:
 
     def get_plan_review_tasks(self) -> List[Dict]:
         """Get tasks waiting for plan review/approval."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -317,7 +540,7 @@ class Database:
 
     def get_cancelled_tasks(self) -> List[Dict]:
         """Get cancelled tasks (need user feedback to re-enable)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -333,26 +556,16 @@ class Database:
 
     def save_plan(self, imp_id: int, plan_content: str, optimized_plan: str = '') -> bool:
         """Save the generated plan and auto-approve for execution."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Get current level to set the right level status
-            cursor = conn.execute('SELECT current_level FROM improvements WHERE id = ?', (imp_id,))
-            row = cursor.fetchone()
-            level = row[0] if row else 1
-            level_status_col = {1: 'mvp_status', 2: 'enhanced_status', 3: 'advanced_status'}.get(level, 'mvp_status')
-
-            conn.execute(f'''
-                UPDATE improvements
-                SET plan_content = ?, plan_status = 'approved', status = 'approved',
-                    optimized_plan = ?, {level_status_col} = 'approved'
-                WHERE id = ?
-            ''', (plan_content, optimized_plan, imp_id))
+        with self._conn() as conn:
+            # Approves the status column of the feature's current level
+            conn.execute(_SAVE_PLAN_SQL, (plan_content, optimized_plan, imp_id))
             conn.commit()
             logger.info(f"Plan saved and auto-approved for #{imp_id}")
             return True
 
     def update_optimized_plan(self, imp_id: int, optimized_plan: str) -> bool:
         """Update the optimized plan summary."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE improvements
                 SET optimized_plan = ?
@@ -363,7 +576,7 @@ class Database:
 
     def approve_plan(self, imp_id: int) -> bool:
         """User approves the plan - ready for execution."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE improvements
                 SET plan_status = 'approved', status = 'approved'
@@ -375,7 +588,7 @@ class Database:
 
     def request_plan_feedback(self, imp_id: int, feedback: str) -> bool:
         """User requests changes to the plan."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE improvements
                 SET plan_status = 'needs_feedback', user_feedback = ?, status = 'pending'
@@ -387,7 +600,7 @@ class Database:
 
     def mark_in_progress(self, imp_id: int) -> bool:
         """Mark task as in progress (being implemented)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             # Get current status to log transition
             cursor = conn.execute('SELECT status, title FROM improvements WHERE id = ?', (imp_id,))
             row = cursor.fetchone()
@@ -406,56 +619,30 @@ class Database:
 
     def mark_testing(self, imp_id: int, output: str = '') -> bool:
         """Mark task as ready for testing and update level status."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Get current level to update the appropriate level status
-            cursor = conn.execute('SELECT current_level FROM improvements WHERE id = ?', (imp_id,))
-            row = cursor.fetchone()
-            current_level = row[0] if row else 1
-
+        with self._conn() as conn:
             # Update level status based on current level
-            level_status_col = {1: 'mvp_status', 2: 'enhanced_status', 3: 'advanced_status'}[current_level]
-
-            conn.execute(f'''
-                UPDATE improvements
-                SET status = 'testing', output = ?, {level_status_col} = 'testing'
-                WHERE id = ?
-            ''', (output, imp_id))
+            conn.execute(_MARK_TESTING_SQL, (output, imp_id))
             conn.commit()
             return True
 
     def mark_test_passed(self, imp_id: int, test_output: str = '') -> bool:
         """Test passed - mark as completed and update level status."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write() as conn:
             # Get current level to update the appropriate level status
             cursor = conn.execute('SELECT current_level FROM improvements WHERE id = ?', (imp_id,))
             row = cursor.fetchone()
             current_level = row[0] if row else 1
 
-            # Determine which level statuses to mark as completed
-            level_updates = []
-            if current_level >= 1:
-                level_updates.append("mvp_status = 'completed'")
-            if current_level >= 2:
-                level_updates.append("enhanced_status = 'completed'")
-            if current_level >= 3:
-                level_updates.append("advanced_status = 'completed'")
-
-            level_sql = ", ".join(level_updates) if level_updates else ""
-            if level_sql:
-                level_sql = ", " + level_sql
-
-            conn.execute(f'''
-                UPDATE improvements
-                SET status = 'completed', test_output = ?, completed_at = ?{level_sql}
-                WHERE id = ?
-            ''', (test_output, datetime.now().isoformat(), imp_id))
+            # Levels up to and including the current one are marked completed
+            conn.execute(_MARK_TEST_PASSED_SQL[max(0, min(current_level, 3))],
+                         (test_output, datetime.now().isoformat(), imp_id))
             conn.commit()
             logger.info(f"Feature #{imp_id} completed successfully at level {current_level}!")
             return True
 
     def mark_test_failed(self, imp_id: int, test_output: str = '') -> bool:
         """Test failed - increment count and check if should be cancelled."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write() as conn:
             # Get current test count
             cursor = conn.execute('SELECT test_count FROM improvements WHERE id = ?', (imp_id,))
             row = cursor.fetchone()
@@ -497,7 +684,7 @@ class Database:
         Returns:
             True if successful
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             if fixed:
                 conn.execute('''
                     UPDATE improvements
@@ -518,7 +705,7 @@ class Database:
 
     def re_enable_cancelled(self, imp_id: int, feedback: str = '') -> bool:
         """Re-enable a cancelled task with optional feedback."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE improvements
                 SET status = 'pending', test_count = 0, user_feedback = ?,
@@ -531,7 +718,7 @@ class Database:
 
     def mark_failed(self, imp_id: int, error: str) -> bool:
         """Mark task as failed with error."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE improvements
                 SET status = 'failed', error = ?, last_error = ?
@@ -542,30 +729,50 @@ class Database:
 
     def _update_status(self, imp_id: int, status: str) -> bool:
         """Update task status."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('UPDATE improvements SET status = ? WHERE id = ?', (status, imp_id))
             conn.commit()
             return True
 
     def get_stats(self) -> Dict:
         """Get statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            stats = {}
-            for status in VALID_STATUSES:
-                cursor = conn.execute("SELECT COUNT(*) FROM improvements WHERE status = ?", (status,))
-                stats[status] = cursor.fetchone()[0]
-            cursor = conn.execute("SELECT COUNT(*) FROM improvements")
-            stats['total'] = cursor.fetchone()[0]
-            return stats
-
-    def exists(self, title: str, similarity_threshold: float = 0.55) -> bool:
+        with self._conn() as conn:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM improvements GROUP BY status"
+            ))
+        stats = {status: counts.get(status, 0) for status in VALID_STATUSES}
+        # Total includes rows whose status isn't one of VALID_STATUSES
+        stats['total'] = sum(counts.values())
+        return stats
+
+    def get_titles(self) -> List[Tuple[str, str]]:
+        """Get (title, status) for every improvement, for batched exists() checks."""
+        with self._conn() as conn:
+            cursor = conn.execute("SELECT title, status FROM improvements")
+            return cursor.fetchall()
+
+    def exists(self, title: str, similarity_threshold: float = 0.55,
+               titles: Optional[List[Tuple[str, str]]] = None) -> bool:
         """Check if improvement with title or similar title already exists.
 
         Uses fuzzy matching to catch near-duplicates like:
         - "Add retry logic" vs "Implement retry logic"
         - "Add health check" vs "Add health check endpoint"
+
+        Pass the result of get_titles() as `titles` when checking many
+        candidates, to avoid re-reading the table for each one.
         """
-        from difflib import SequenceMatcher
+        if titles is None:
+            # Exact duplicates are an idx_title probe; only fall back to
+            # reading every title for the fuzzy comparison
+            with self._conn() as conn:
+                if conn.execute('SELECT 1 FROM improvements WHERE title = ? LIMIT 1',
+                                (title,)).fetchone():
+                    return True
+            titles = self.get_titles()
+        # Caller-supplied titles: exact match first (the probe covers it otherwise)
+        elif any(existing == title for existing, _ in titles):
+            return True
 
         # Normalize title for comparison
         title_normalized = title.lower().strip()
@@ -575,38 +782,31 @@ class Database:
                       'of', 'in', 'on', 'a', 'an', 'cli', 'calls', 'system', 'feature'}
         key_words = set(w for w in title_normalized.split() if w not in noise_words and len(w) > 2)
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Exact match first
-            cursor = conn.execute("SELECT 1 FROM improvements WHERE title = ?", (title,))
-            if cursor.fetchone() is not None:
-                return True
-
-            # Get all existing titles for fuzzy matching
-            cursor = conn.execute("SELECT title FROM improvements WHERE status != 'cancelled'")
-            existing_titles = [row[0] for row in cursor.fetchall()]
+        # Fuzzy match against non-cancelled titles
+        for existing, status in titles:
+            if status == 'cancelled':
+                continue
+            existing_normalized = existing.lower().strip()
 
-            for existing in existing_titles:
-                existing_normalized = existing.lower().strip()
+            # Check string similarity
+            similarity = SequenceMatcher(None, title_normalized, existing_normalized).ratio()
+            if similarity >= similarity_threshold:
+                return True
 
-                # Check string similarity
-                similarity = SequenceMatcher(None, title_normalized, existing_normalized).ratio()
-                if similarity >= similarity_threshold:
+            # Check key word overlap - use min to catch short titles contained in longer ones
+            existing_words = set(w for w in existing_normalized.split()
+                                if w not in noise_words and len(w) > 2)
+            if key_words and existing_words:
+                # Use min to catch "retry logic" in "retry logic for claude cli"
+                overlap = len(key_words & existing_words) / min(len(key_words), len(existing_words))
+                if overlap >= 0.6:  # 60% of shorter set overlaps
                     return True
 
-                # Check key word overlap - use min to catch short titles contained in longer ones
-                existing_words = set(w for w in existing_normalized.split()
-                                    if w not in noise_words and len(w) > 2)
-                if key_words and existing_words:
-                    # Use min to catch "retry logic" in "retry logic for claude cli"
-                    overlap = len(key_words & existing_words) / min(len(key_words), len(existing_words))
-                    if overlap >= 0.6:  # 60% of shorter set overlaps
-                        return True
-
-            return False
+        return False
 
     def get_active_count(self) -> int:
         """Get count of active tasks (in_progress + testing)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.execute('''
                 SELECT COUNT(*) FROM improvements
                 WHERE status IN ('in_progress', 'testing', 'planning')
@@ -621,7 +821,7 @@ class Database:
                        priority: int, discovery_source: str, metadata: Dict,
                        confidence: float = 0.5) -> int:
         """Add a discovered improvement with metadata."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.execute('''
                 INSERT INTO improvements
                 (title, description, category, priority, source, created_at, status,
@@ -633,9 +833,32 @@ class Database:
             conn.commit()
             return cursor.lastrowid
 
+    def add_discovered_many(self, discoveries: List[Dict]) -> int:
+        """Add several discovered improvements in a single transaction.
+
+        Each dict takes the keyword arguments of add_discovered().
+        Returns the number of rows inserted.
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (d['title'], d['description'], d['category'], d['priority'], now,
+             d['discovery_source'], json.dumps(d['metadata']), now,
+             d.get('confidence', 0.5))
+            for d in discoveries
+        ]
+        with self._write() as conn:
+            conn.executemany('''
+                INSERT INTO improvements
+                (title, description, category, priority, source, created_at, status,
+                 discovery_source, discovery_metadata, discovery_timestamp, confidence_score)
+                VALUES (?, ?, ?, ?, 'ai_discovered', ?, 'pending', ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        return len(rows)
+
     def get_plan_for_reuse(self, imp_id: int) -> Optional[str]:
         """Get original plan for a task (for retry reuse)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             # First check if this task has an original_plan_id
             cursor = conn.execute(
                 'SELECT original_plan_id, plan_content FROM improvements WHERE id = ?',
@@ -662,7 +885,7 @@ class Database:
 
     def link_to_original_plan(self, new_id: int, original_id: int) -> bool:
         """Link a retried task to its original plan."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute(
                 'UPDATE improvements SET original_plan_id = ? WHERE id = ?',
                 (original_id, new_id)
@@ -672,7 +895,7 @@ class Database:
 
     def get_discoveries_by_category(self, category: str) -> List[Dict]:
         """Get all discovered improvements by category."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT * FROM improvements
@@ -683,7 +906,7 @@ class Database:
 
     def get_discovery_stats(self) -> Dict:
         """Get statistics about discovered improvements."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             stats = {}
             cursor = conn.execute('''
                 SELECT discovery_source, COUNT(*) as count
@@ -706,7 +929,7 @@ class Database:
         Returns:
             True if successful
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute(
                 'UPDATE improvements SET worktree_path = ?, branch_name = ? WHERE id = ?',
                 (worktree_path, branch_name, imp_id)
@@ -726,7 +949,7 @@ class Database:
             True if successful
         """
         conflict_str = json.dumps(conflicted_files)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute(
                 'UPDATE improvements SET merge_conflicts = ? WHERE id = ?',
                 (conflict_str, imp_id)
@@ -744,7 +967,7 @@ class Database:
         Returns:
             True if successful
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute(
                 'UPDATE improvements SET worktree_path = NULL, branch_name = NULL WHERE id = ?',
                 (imp_id,)
@@ -759,7 +982,7 @@ class Database:
         if level == 1:
             return True, 'MVP level is always available'
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             level_name = 'enhanced' if level == 2 else 'advanced'
             cursor = conn.execute(
                 'SELECT unlocked_at, required_count, completed_count FROM level_unlocks WHERE level = ?',
@@ -774,16 +997,18 @@ class Database:
 
     def check_and_unlock_levels(self):
         """Check if any levels should be unlocked based on completed features."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write() as conn:
+            # Counts stop at the unlock threshold: past it the level is unlocked
+            # and the stored count is no longer shown (see is_level_unlocked)
             # Count features with passed MVP tests
             cursor = conn.execute(
-                "SELECT COUNT(*) FROM improvements WHERE mvp_status = 'completed'"
+                "SELECT COUNT(*) FROM (SELECT 1 FROM improvements WHERE mvp_status = 'completed' LIMIT 5)"
             )
             mvp_completed = cursor.fetchone()[0]
 
             # Count features with passed Enhanced tests
             cursor = conn.execute(
-                "SELECT COUNT(*) FROM improvements WHERE enhanced_status = 'completed'"
+                "SELECT COUNT(*) FROM (SELECT 1 FROM improvements WHERE enhanced_status = 'completed' LIMIT 10)"
             )
             enhanced_completed = cursor.fetchone()[0]
 
@@ -815,23 +1040,17 @@ class Database:
 
     def get_features_for_level(self, level: int, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get features ready for implementation at a specific level."""
-        level_status_col = {1: 'mvp_status', 2: 'enhanced_status', 3: 'advanced_status'}[level]
+        sql = _FEATURES_FOR_LEVEL_SQL[level]
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
             # Features at this level that are approved/ready (exclude already processing)
-            cursor = conn.execute(f'''
-                SELECT * FROM improvements
-                WHERE current_level = ? AND {level_status_col} = 'approved'
-                AND status = 'approved'
-                ORDER BY priority DESC
-                LIMIT ?
-            ''', (level, limit))
+            cursor = conn.execute(sql, (level, limit))
             return [dict(row) for row in cursor.fetchall()]
 
     def advance_to_next_level(self, imp_id: int) -> bool:
         """Advance a feature to the next level after passing tests."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write() as conn:
             cursor = conn.execute('SELECT current_level FROM improvements WHERE id = ?', (imp_id,))
             row = cursor.fetchone()
             if not row:
@@ -842,39 +1061,25 @@ class Database:
                 return False  # Already at max level
 
             next_level = current + 1
-            next_status_col = {2: 'enhanced_status', 3: 'advanced_status'}[next_level]
-
-            conn.execute(f'''
-                UPDATE improvements
-                SET current_level = ?, {next_status_col} = 'pending'
-                WHERE id = ?
-            ''', (next_level, imp_id))
+            conn.execute(_ADVANCE_LEVEL_SQL[next_level], (next_level, imp_id))
             conn.commit()
             return True
 
     def mark_level_completed(self, imp_id: int, level: int, output: str) -> bool:
         """Mark a level's implementation as complete, ready for testing."""
-        cols = {1: ('mvp_status', 'mvp_output'), 2: ('enhanced_status', 'enhanced_output'), 3: ('advanced_status', 'advanced_output')}
-        status_col, output_col = cols[level]
+        sql = _MARK_LEVEL_COMPLETED_SQL[level]
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(f'''
-                UPDATE improvements SET {status_col} = 'testing', {output_col} = ?
-                WHERE id = ?
-            ''', (output, imp_id))
+        with self._conn() as conn:
+            conn.execute(sql, (output, imp_id))
             conn.commit()
             return True
 
     def mark_level_test_passed(self, imp_id: int, level: int, test_output: str) -> bool:
         """Mark a level's tests as passed."""
-        cols = {1: ('mvp_status', 'mvp_test_output'), 2: ('enhanced_status', 'enhanced_test_output'), 3: ('advanced_status', 'advanced_test_output')}
-        status_col, test_col = cols[level]
+        sql = _MARK_LEVEL_PASSED_SQL[level]
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(f'''
-                UPDATE improvements SET {status_col} = 'completed', {test_col} = ?
-                WHERE id = ?
-            ''', (test_output, imp_id))
+        with self._conn() as conn:
+            conn.execute(sql, (test_output, imp_id))
             conn.commit()
 
             # Check if feature is fully complete (all 3 levels)
@@ -891,70 +1096,40 @@ class Database:
 
     def get_pending_planning_for_level(self, level: int, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get features that need planning at a specific level."""
-        level_status_col = {1: 'mvp_status', 2: 'enhanced_status', 3: 'advanced_status'}[level]
+        sql = _PENDING_PLANNING_FOR_LEVEL_SQL[level]
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute(f'''
-                SELECT * FROM improvements
-                WHERE current_level = ? AND {level_status_col} = 'pending'
-                AND status != 'cancelled'
-                ORDER BY priority DESC, created_at ASC
-                LIMIT ?
-            ''', (level, limit))
+            cursor = conn.execute(sql, (level, limit))
             return [dict(row) for row in cursor.fetchall()]
 
     def get_features_for_testing_at_level(self, level: int, limit: int = MAX_PARALLEL_TASKS) -> List[Dict]:
         """Get features that need testing at a specific level."""
-        level_status_col = {1: 'mvp_status', 2: 'enhanced_status', 3: 'advanced_status'}[level]
-        level_test_count_col = {1: 'mvp_test_count', 2: 'enhanced_test_count', 3: 'advanced_test_count'}[level]
+        sql = _TESTING_AT_LEVEL_SQL[level]
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute(f'''
-                SELECT * FROM improvements
-                WHERE current_level = ? AND {level_status_col} = 'testing'
-                AND {level_test_count_col} < ?
-                AND status != 'cancelled'
-                ORDER BY priority DESC
-                LIMIT ?
-            ''', (level, MAX_TEST_ATTEMPTS, limit))
+            cursor = conn.execute(sql, (level, MAX_TEST_ATTEMPTS, limit))
             return [dict(row) for row in cursor.fetchall()]
 
     def get_stats_by_level(self) -> Dict:
         """Get statistics grouped by level."""
-        with sqlite3.connect(self.db_path) as conn:
-            stats = {}
-            for level_name in ['MVP', 'Enhanced', 'Advanced']:
-                level_num = {'MVP': 1, 'Enhanced': 2, 'Advanced': 3}[level_name]
-                status_col = level_name.lower() + '_status'
-
-                cursor = conn.execute(f'''
-                    SELECT COUNT(*) FROM improvements WHERE {status_col} = 'completed'
-                ''')
-                completed = cursor.fetchone()[0]
-
-                cursor = conn.execute(f'''
-                    SELECT COUNT(*) FROM improvements WHERE {status_col} IN ('testing', 'approved')
-                ''')
-                in_progress = cursor.fetchone()[0]
-
-                cursor = conn.execute(f'''
-                    SELECT COUNT(*) FROM improvements WHERE {status_col} = 'pending' AND current_level = ?
-                ''', (level_num,))
-                pending = cursor.fetchone()[0]
-
-                stats[level_name] = {
-                    'completed': completed,
-                    'in_progress': in_progress,
-                    'pending': pending
-                }
-
-            return stats
+        with self._conn() as conn:
+            row = conn.execute(_STATS_BY_LEVEL_SQL).fetchone()
+
+        stats = {}
+        for i, (level_name, _) in enumerate(_STATS_LEVELS):
+            completed, in_progress, pending = row[i * 3:i * 3 + 3]
+            stats[level_name] = {
+                'completed': completed,
+                'in_progress': in_progress,
+                'pending': pending
+            }
+        return stats
 
     def get_recovery_stats(self) -> Dict:
         """Get statistics about task recovery and lifecycle."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             stats = {}
 
             # Count stuck tasks
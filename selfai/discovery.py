@@ -12,6 +12,9 @@ from datetime import datetime
 
 logger = logging.getLogger('selfai')
 
+# JSON array of finding objects in Claude's discovery output
+_FINDINGS_JSON_RE = re.compile(r'\[\s*\{.*\}\s*\]', re.DOTALL)
+
 
 def _create_subprocess_error_response(result: subprocess.CompletedProcess, context: str, timed_out: bool = False) -> dict:
     """Create structured error response for failed Claude CLI calls.
@@ -271,7 +274,7 @@ Return JSON array:
         """Parse Claude's JSON output into DiscoveredImprovement objects."""
         try:
             # Extract JSON from output (may have surrounding text)
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', output, re.DOTALL)
+            json_match = _FINDINGS_JSON_RE.search(output)
             if not json_match:
                 return []
 
@@ -337,4 +340,5 @@ Return JSON array:
 
     def _filter_existing(self, discoveries: List[DiscoveredImprovement]) -> List[DiscoveredImprovement]:
         """Filter out discoveries that already exist in database."""
-        return [d for d in discoveries if not self.db.exists(d.title)]
+        titles = self.db.get_titles()
+        return [d for d in discoveries if not self.db.exists(d.title, titles=titles)]
@@ -9,6 +9,7 @@ import os
 import shutil
 import sqlite3
 import subprocess
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
@@ -387,14 +388,35 @@ class KnowledgeBase:
             db_path: Path to knowledge base database file
         """
         self.db_path = db_path
+        # One connection for the life of the object, shared with the
+        # monitor's health check thread and serialized by the lock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
         self._init_db()
 
+    def _connection(self) -> sqlite3.Connection:
+        """Return the knowledge base connection, opening it on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the knowledge base connection (reopened on next use)."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _init_db(self):
         """Initialize knowledge base database schema."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
-            conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn_lock, self._connection() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS healing_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -425,7 +447,7 @@ class KnowledgeBase:
             result: Result of the healing action
         """
         try:
-            with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
+            with self._conn_lock, self._connection() as conn:
                 conn.execute('''
                     INSERT INTO healing_history
                     (error_type, error_line, diagnosis, action_taken, success, timestamp, context)
@@ -456,8 +478,7 @@ class KnowledgeBase:
             List of similar healing history records
         """
         try:
-            with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._conn_lock, self._connection() as conn:
                 cursor = conn.execute('''
                     SELECT * FROM healing_history
                     WHERE error_type = ? AND success = 1
@@ -476,8 +497,7 @@ class KnowledgeBase:
             Dictionary of error_type -> statistics
         """
         try:
-            with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._conn_lock, self._connection() as conn:
                 cursor = conn.execute('''
                     SELECT error_type,
                            COUNT(*) as total_attempts,
@@ -499,6 +519,25 @@ class KnowledgeBase:
             logger.error(f"Failed to get statistics: {e}")
             return {}
 
+    def get_recent_history(self, limit: int = 10) -> List[Dict]:
+        """
+        Get the most recent healing attempts, newest first.
+
+        Args:
+            limit: Maximum number of records to return
+
+        Returns:
+            List of healing history records
+        """
+        # idx_timestamp serves the ORDER BY ... DESC LIMIT as a reverse index scan
+        with self._conn_lock, self._connection() as conn:
+            cursor = conn.execute('''
+                SELECT error_type, success, timestamp, diagnosis
+                FROM healing_history
+                ORDER BY timestamp DESC LIMIT ?
+            ''', (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
     def cleanup_old_records(self, days: int = 30, max_records_per_type: int = 1000):
         """
         Clean up old healing records to prevent unbounded growth.
@@ -511,7 +550,7 @@ class KnowledgeBase:
             cutoff_date = datetime.now().timestamp() - (days * 24 * 3600)
             cutoff_iso = datetime.fromtimestamp(cutoff_date).isoformat()
 
-            with sqlite3.connect(str(self.db_path), timeout=30.0) as conn:
+            with self._conn_lock, self._connection() as conn:
                 # Remove old records
                 cursor = conn.execute('''
                     DELETE FROM healing_history
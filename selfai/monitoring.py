@@ -148,6 +148,8 @@ class SelfHealingMonitor:
         if self._health_check_thread:
             self._health_check_thread.join(timeout=5)
 
+        self.knowledge_base.close()
+
     def process_error(self, error: DetectedError):
         """
         Process a detected error through MAPE-K loop.
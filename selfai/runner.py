@@ -13,12 +13,17 @@ import subprocess
 import time
 import json
 import logging
+import logging.handlers
+import mmap
 import shutil
 import fcntl
 import re
+import threading
 import psutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from string import Template
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from difflib import SequenceMatcher
@@ -30,9 +35,72 @@ from .monitoring import SelfHealingMonitor
 from .worktree_manager import WorktreeManager
 from .exceptions import ValidationError, GitOperationError
 
+try:
+    import orjson  # Optional: faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger('selfai')
 
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serialize to 2-space indented UTF-8 JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+# Fenced ```json blocks in Claude output
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)```')
+# Widest object/array spans, used as a last resort
+_JSON_FALLBACK_RES = (re.compile(r'(\{[\s\S]*\})'), re.compile(r'(\[[\s\S]*\])'))
+
+# Log line keywords for LogAnalyzer, in priority order, with the issue type they map to
+_LOG_ISSUE_KEYWORDS = (
+    ('ERROR', 'error'),
+    ('Exception', 'exception'),
+    ('Failed', 'failure'),
+    ('Timeout', 'timeout'),
+    ('CONFLICT', 'conflict'),
+)
+# One match per line: each alternative is a lookahead over the whole line tried at
+# its start, so the first keyword in priority order wins (not the leftmost one).
+# The named group holding the detail is the issue type.
+_LOG_ISSUE_RE = re.compile('^(?:' + '|'.join(
+    rf'(?=.*?{keyword}[:\s]+(?P<{issue_type}>.+))' for keyword, issue_type in _LOG_ISSUE_KEYWORDS
+) + ')')
+# Canonical issue type strings: every issue and stored pattern shares one object
+# per type, so type comparisons succeed on identity before comparing characters
+_ISSUE_TYPES = {issue_type: sys.intern(issue_type) for _, issue_type in _LOG_ISSUE_KEYWORDS}
+_LOG_TIMESTAMP_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})')
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_OPENER_RE = re.compile(r'[{\[]')
+
+
+def _decode_json_prefix(text: str) -> Optional[dict | list]:
+    """Decode the first JSON object or list of objects embedded in text.
+
+    Every '{' or '[' is tried in order of position and trailing text is
+    ignored, so an array of objects is returned whole rather than as its
+    first element. Values that decode to anything else, like the "[1]" in
+    "Per finding [1], ...", are skipped in favour of the next opener.
+    """
+    for match in _JSON_OPENER_RE.finditer(text):
+        try:
+            value = _JSON_DECODER.raw_decode(text, match.start())[0]
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict) or (
+                isinstance(value, list) and all(isinstance(item, dict) for item in value)):
+            return value
+    return None
+
+
 def _extract_json_from_output(output: str) -> Optional[dict | list]:
     """
     Safely extract JSON from Claude CLI output.
@@ -50,23 +118,27 @@ def _extract_json_from_output(output: str) -> Optional[dict | list]:
     text = output.strip()
 
     # Try to extract from markdown code blocks first
-    import re
-    json_block = re.search(r'```(?:json)?\s*([\s\S]*?)```', text)
+    json_block = _JSON_BLOCK_RE.search(text)
     if json_block:
         text = json_block.group(1).strip()
 
     # Try direct parse
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except json.JSONDecodeError:
         pass
 
-    # Try to find JSON object or array in the text
-    for pattern in [r'(\{[\s\S]*\})', r'(\[[\s\S]*\])']:
-        match = re.search(pattern, text)
+    # Decode the first JSON object or list of objects embedded in the text
+    data = _decode_json_prefix(text)
+    if data is not None:
+        return data
+
+    # Fall back to the widest span between the outermost brackets
+    for pattern in _JSON_FALLBACK_RES:
+        match = pattern.search(text)
         if match:
             try:
-                return json.loads(match.group(1))
+                return _json_loads(match.group(1))
             except json.JSONDecodeError:
                 continue
 
@@ -207,51 +279,574 @@ LEVEL_GUIDANCE = {
     }
 }
 
+# Static per-level prompt fragments, built once from LEVEL_GUIDANCE
+_TEST_CRITERIA = {
+    level: (
+        f"\n## {guidance['name']} Test Criteria (Level {level}/3)\n"
+        + '\n'.join(f'  {i+1}. {c}' for i, c in enumerate(guidance['test_criteria']))
+        + '\n'
+    )
+    for level, guidance in LEVEL_GUIDANCE.items()
+}
+_PLAN_SCOPE_LISTS = {
+    level: (
+        '\n'.join(f'  - {s}' for s in guidance['scope']),
+        '\n'.join(f'  - {t}' for t in guidance['test_criteria']),
+    )
+    for level, guidance in LEVEL_GUIDANCE.items()
+}
+
+# Column prefixes per level, indexed by level number (index 0 unused)
+_LEVEL_KEYS = (None, 'mvp', 'enhanced', 'advanced')
+_LEVEL_TEST_COUNT_COLUMNS = tuple(key and f'{key}_test_count' for key in _LEVEL_KEYS)
+
+
+# Dashboard rendering: static markup is parsed once, only values are filled in
+_STATUS_COLORS = {
+    'pending': '#6b7280',
+    'planning': '#8b5cf6',
+    'plan_review': '#f59e0b',
+    'approved': '#06b6d4',  # Cyan - ready for execution
+    'in_progress': '#3b82f6',
+    'testing': '#6366f1',
+    'completed': '#22c55e',
+    'failed': '#ef4444',
+    'cancelled': '#dc2626',
+}
+_DISCOVERY_CATEGORY_ICONS = {
+    'security': '🔒',
+    'test_coverage': '🧪',
+    'refactoring': '🔧',
+    'documentation': '📝',
+    'performance': '⚡',
+    'code_quality': '✨'
+}
+_STUCK_BANNER_TEMPLATE = Template(
+    '<div class="warning-banner" style="background: rgba(245, 158, 11, 0.2); padding: 15px; border-radius: 8px; margin-bottom: 20px; border-left: 4px solid #f59e0b;">'
+    '⚠️ <strong>$stuck_count stuck in-progress task(s)</strong> detected (may be from crashed processes)'
+    '<br><small>Will be resumed on next run</small></div>'
+)
+
+_DISCOVERY_CARD_TEMPLATE = Template('''
+            <div class="stat-card" style="background: rgba(123, 44, 191, 0.2);">
+                <div class="value" style="color: #a78bfa">$icon $count</div>
+                <div class="label">$name</div>
+            </div>
+            ''')
+
+_DASHBOARD_ROW_TEMPLATE = Template('''
+            <tr class="$status">
+                <td>$id</td>
+                <td>$title$worktree_info</td>
+                <td><span class="status-badge" style="background: ${color}20; color: $color">$status</span></td>
+                <td class="plan-cell">$preview$preview_suffix</td>
+                <td>$test_info</td>
+                <td>$actions</td>
+            </tr>
+            ''')
+
+_DASHBOARD_TEMPLATE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SelfAI Dashboard</title>
+    <meta http-equiv="refresh" content="30">
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+            min-height: 100vh;
+            padding: 20px;
+            color: #fff;
+        }
+        .container { max-width: 1400px; margin: 0 auto; }
+        h1 {
+            text-align: center;
+            margin-bottom: 20px;
+            background: linear-gradient(90deg, #00d4ff, #7b2cbf);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        .stats {
+            display: flex;
+            gap: 15px;
+            flex-wrap: wrap;
+            justify-content: center;
+            margin-bottom: 20px;
+        }
+        .stat-card {
+            background: rgba(255,255,255,0.1);
+            padding: 15px 25px;
+            border-radius: 10px;
+            text-align: center;
+        }
+        .stat-card .value { font-size: 1.5rem; font-weight: bold; }
+        .stat-card .label { color: #888; font-size: 0.8rem; }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            background: rgba(255,255,255,0.05);
+            border-radius: 10px;
+            overflow: hidden;
+        }
+        th { background: rgba(255,255,255,0.1); padding: 12px; text-align: left; }
+        td { padding: 10px 12px; border-bottom: 1px solid rgba(255,255,255,0.05); }
+        .status-badge {
+            padding: 4px 10px;
+            border-radius: 12px;
+            font-size: 0.75rem;
+            font-weight: 600;
+        }
+        .plan-cell {
+            max-width: 300px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+            color: #888;
+            font-size: 0.85rem;
+        }
+        .btn-approve, .btn-feedback, .btn-reenable, .btn-view {
+            padding: 5px 10px;
+            border: none;
+            border-radius: 5px;
+            cursor: pointer;
+            font-size: 0.75rem;
+            margin: 2px;
+        }
+        .btn-approve { background: #22c55e; color: white; }
+        .btn-feedback { background: #f59e0b; color: white; }
+        .btn-reenable { background: #6366f1; color: white; }
+        .btn-view { background: #3b82f6; color: white; }
+        tr.plan_review { background: rgba(245, 158, 11, 0.1); }
+        tr.cancelled { background: rgba(220, 38, 38, 0.1); opacity: 0.7; }
+        tr.completed { opacity: 0.6; }
+
+        /* Modal */
+        .modal {
+            display: none;
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0,0,0,0.8);
+            justify-content: center;
+            align-items: center;
+        }
+        .modal-content {
+            background: #1a1a2e;
+            padding: 30px;
+            border-radius: 15px;
+            max-width: 600px;
+            width: 90%;
+        }
+        .modal-content.wide {
+            max-width: 90%;
+            max-height: 90vh;
+            overflow-y: auto;
+        }
+        .plan-content {
+            background: #16213e;
+            padding: 20px;
+            border-radius: 8px;
+            white-space: pre-wrap;
+            font-family: monospace;
+            font-size: 0.85rem;
+            max-height: 60vh;
+            overflow-y: auto;
+            line-height: 1.5;
+        }
+        .modal textarea {
+            width: 100%;
+            height: 150px;
+            margin: 15px 0;
+            padding: 10px;
+            border-radius: 8px;
+            border: 1px solid #333;
+            background: #16213e;
+            color: #fff;
+        }
+        .modal button {
+            padding: 10px 20px;
+            margin: 5px;
+            border: none;
+            border-radius: 8px;
+            cursor: pointer;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>SelfAI Dashboard</h1>
+        <p style="text-align: center; color: #888; margin-bottom: 20px;">
+            Planning-First Workflow | Max ${max_parallel} Parallel | ${max_tests} Test Attempts
+        </p>
+
+        $stuck_banner
+
+        <div class="stats">
+            <div class="stat-card">
+                <div class="value" style="color: #f59e0b">$plan_review</div>
+                <div class="label">Awaiting Review</div>
+            </div>
+            <div class="stat-card">
+                <div class="value" style="color: #10b981">$approved</div>
+                <div class="label">Approved</div>
+            </div>
+            <div class="stat-card">
+                <div class="value" style="color: #3b82f6">$in_progress</div>
+                <div class="label">In Progress</div>
+            </div>
+            <div class="stat-card">
+                <div class="value" style="color: #22c55e">$completed</div>
+                <div class="label">Completed</div>
+            </div>
+            <div class="stat-card">
+                <div class="value" style="color: #dc2626">$cancelled</div>
+                <div class="label">Cancelled</div>
+            </div>
+            <div class="stat-card">
+                <div class="value" style="color: #f59e0b">$stuck_count</div>
+                <div class="label">Stuck Tasks</div>
+            </div>
+        </div>
+
+        $discovery
+
+        <table>
+            <thead>
+                <tr>
+                    <th>ID</th>
+                    <th>Feature</th>
+                    <th>Status</th>
+                    <th>Key Features</th>
+                    <th>Tests</th>
+                    <th>Actions</th>
+                </tr>
+            </thead>
+            <tbody>
+                $rows
+            </tbody>
+        </table>
+    </div>
+
+    <!-- Feedback Modal -->
+    <div id="feedbackModal" class="modal">
+        <div class="modal-content">
+            <h3>Provide Feedback</h3>
+            <p>Your feedback will be incorporated into a revised plan:</p>
+            <textarea id="feedbackText" placeholder="Describe what changes you want..."></textarea>
+            <button onclick="submitFeedback()" style="background: #f59e0b; color: white;">Submit</button>
+            <button onclick="closeModal()" style="background: #6b7280; color: white;">Cancel</button>
+        </div>
+    </div>
+
+    <!-- Plan Modal -->
+    <div id="planModal" class="modal">
+        <div class="modal-content wide">
+            <h3 id="planTitle">Plan Details</h3>
+            <div id="planContent" class="plan-content"></div>
+            <div style="margin-top: 15px; text-align: right;">
+                <button onclick="closePlanModal()" style="background: #6b7280; color: white;">Close</button>
+            </div>
+        </div>
+    </div>
+
+    <script>
+        let currentTaskId = null;
+        const plans = $plans;
+
+        function showToast(msg, isError) {
+            const toast = document.createElement('div');
+            toast.style.cssText = 'position:fixed;bottom:20px;right:20px;padding:15px 25px;border-radius:8px;color:white;z-index:10000;background:' + (isError ? '#ef4444' : '#22c55e');
+            toast.textContent = msg;
+            document.body.appendChild(toast);
+            setTimeout(() => toast.remove(), 3000);
+        }
+
+        async function apiCall(endpoint, method, body) {
+            try {
+                const response = await fetch(endpoint, {
+                    method: method,
+                    headers: { 'Content-Type': 'application/json' },
+                    body: body ? JSON.stringify(body) : undefined
+                });
+                const data = await response.json();
+                if (data.success) {
+                    showToast(data.message);
+                    setTimeout(() => location.reload(), 1000);
+                } else {
+                    showToast(data.error || 'Request failed', true);
+                }
+            } catch (e) {
+                showToast('Server not running. Start with: python -m selfai serve', true);
+            }
+        }
+
+        function showPlan(id) {
+            const plan = plans[id];
+            const modal = document.getElementById('planModal');
+            const title = document.getElementById('planTitle');
+            const content = document.getElementById('planContent');
+            if (plan && modal && title && content) {
+                title.textContent = 'Plan for Task #' + id;
+                content.textContent = plan;
+                modal.style.display = 'flex';
+            } else {
+                alert('Plan not found for task #' + id);
+            }
+        }
+
+        function closePlanModal() {
+            document.getElementById('planModal').style.display = 'none';
+        }
+
+        function approvePlan(id) {
+            if (confirm('Approve plan for task #' + id + '?')) {
+                apiCall('/api/approve/' + id, 'POST');
+            }
+        }
+
+        function showFeedback(id) {
+            currentTaskId = id;
+            document.getElementById('feedbackModal').style.display = 'flex';
+        }
+
+        function closeModal() {
+            document.getElementById('feedbackModal').style.display = 'none';
+        }
+
+        function submitFeedback() {
+            const feedback = document.getElementById('feedbackText').value;
+            if (feedback) {
+                apiCall('/api/feedback/' + currentTaskId, 'POST', { feedback: feedback });
+            }
+            closeModal();
+        }
+
+        function reEnable(id) {
+            const feedback = prompt('Optional feedback for re-enabling task #' + id + ':', '');
+            if (feedback !== null) {
+                apiCall('/api/reenable/' + id, 'POST', { feedback: feedback });
+            }
+        }
+
+        // Close modals when clicking outside
+        document.addEventListener('click', function(e) {
+            if (e.target.classList.contains('modal')) {
+                e.target.style.display = 'none';
+            }
+        });
+    </script>
+</body>
+</html>''')
+
+
+# Single-pass translation tables for text placed into dashboard markup
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+_PREVIEW_ESCAPE = str.maketrans({'"': '&quot;', '<': '&lt;', '\n': ' '})
+
+
+@lru_cache(maxsize=512)
+def _escape_title(title: str) -> str:
+    """HTML-escape a task title; titles never change, so results are cached."""
+    return title.translate(_HTML_ESCAPE)
+
 
 class LogAnalyzer:
     """Analyzes system logs for errors, patterns, and performance issues."""
 
+    # Seconds during which a repeat of an already reported issue is dropped
+    ISSUE_DEDUP_WINDOW = 300
+
+    # Leading bytes of the log recorded with cached analyses, to detect rewrites
+    ANALYSIS_HEAD_BYTES = 64
+
     def __init__(self, data_dir: Path, claude_cmd: str):
         self.data_dir = data_dir
         self.log_dir = data_dir / 'logs'
         self.log_file = self.log_dir / 'runner.log'
         self.claude_cmd = claude_cmd
 
-        # Pattern library
-        self.error_patterns = [
-            (r'ERROR[:\s]+(.+)', 'error'),
-            (r'Exception[:\s]+(.+)', 'exception'),
-            (r'Failed[:\s]+(.+)', 'failure'),
-            (r'Timeout[:\s]+(.+)', 'timeout'),
-            (r'CONFLICT[:\s]+(.+)', 'conflict'),
-        ]
-
         # Learning database
         self.issues_file = self.data_dir / 'issues.json'
         self.improvements_file = self.data_dir / 'improvements.json'
         self.patterns_db = self.data_dir / 'patterns.json'
 
+        # Serializes read-modify-write of patterns.json across diagnose threads
+        self._patterns_lock = threading.Lock()
+
+        # Incremental analysis state
+        self.checkpoint_file = self.data_dir / 'log_offset.json'
+
+        # analyze_logs() result cache, keyed on the log's identity and size
+        self.analysis_cache_file = self.data_dir / 'cache' / 'log_analysis.json'
+        self._analysis_memo: Optional[Dict] = None
+
     def analyze_logs(self, max_lines: int = 10000) -> Dict:
-        """Analyze recent logs for errors and patterns."""
+        """Analyze recent logs for errors and patterns.
+
+        The result is cached in memory and on disk until the log changes.
+        When the log has only been appended to, just the new lines are
+        scanned and merged into the cached result.
+        """
+        try:
+            f = open(self.log_file, 'rb')
+        except FileNotFoundError:
+            return {'log_lines': 0, 'issues': [], 'issues_found': 0}
+
+        with f:
+            # The key describes exactly the bytes scanned below: everything is
+            # read through this descriptor and only up to st_size, so lines
+            # appended meanwhile are left for the next extension
+            st = os.fstat(f.fileno())
+            key = [st.st_ino, st.st_mtime_ns, st.st_size, max_lines]
+            entry = self._analysis_memo
+            if entry is None or entry['key'] != key:
+                entry = self._load_analysis_cache()
+                if entry.get('key') != key:
+                    entry = (self._extend_analysis(entry, f, st, max_lines)
+                             or self._full_analysis(f, st.st_size, max_lines))
+                    entry['key'] = key
+                    self._save_analysis_cache(entry)
+                self._analysis_memo = entry
+
+        # Callers get their own list; the issue dicts are shared
+        return {
+            'log_lines': entry['log_lines'],
+            'issues': list(entry['issues']),
+            'issues_found': len(entry['issues'])
+        }
+
+    def _full_analysis(self, f: BinaryIO, size: int, max_lines: int) -> Dict:
+        """Scan the last `max_lines` lines of the first `size` bytes of `f` into a cache entry."""
+        f.seek(0)
+        head = f.read(min(size, self.ANALYSIS_HEAD_BYTES))
+        lines = self._tail_lines(f, size, max_lines)
+        positions, issues = self._scan_lines_at(lines)
+        return {
+            'head': head.hex(),
+            'log_lines': len(lines),
+            'ends_with_newline': lines[-1] == '',
+            'issues': issues,
+            'issue_lines': positions,
+        }
+
+    def _extend_analysis(self, entry: Dict, f: BinaryIO, st: os.stat_result,
+                         max_lines: int) -> Optional[Dict]:
+        """Merge the lines appended since `entry` was cached, up to st.st_size, into a new entry.
+
+        Returns None unless the log is the same file, has only grown, and the
+        cached scan ended on a line boundary.
+        """
+        old_key = entry.get('key')
+        if (not old_key or old_key[0] != st.st_ino or old_key[3] != max_lines
+                or old_key[2] >= st.st_size or not entry.get('ends_with_newline')):
+            return None
+
+        # Guard against a log truncated in place and regrown: the start of the
+        # file must be unchanged and the cached last byte still a newline
+        boundary = min(old_key[2], 1)
+        # (a log shorter than ANALYSIS_HEAD_BYTES when cached has a shorter head)
+        head = bytes.fromhex(entry.get('head', ''))
+        f.seek(0)
+        if f.read(len(head)) != head:
+            return None
+        f.seek(old_key[2] - boundary)
+        data = f.read(st.st_size - old_key[2] + boundary)
+        if data[:boundary] != b'\n'[:boundary]:
+            return None
+        new_lines = data[boundary:].decode('utf-8', errors='replace').split('\n')
+
+        # The cached window's trailing '' is replaced by the first new line
+        kept = entry['log_lines'] - 1
+        total = kept + len(new_lines)
+        dropped = max(0, total - max_lines)
+
+        positions, issues = [], []
+        for position, issue in zip(entry['issue_lines'], entry['issues']):
+            if position >= dropped:
+                positions.append(position - dropped)
+                issues.append(issue)
+        skip = max(0, dropped - kept)
+        new_positions, new_issues = self._scan_lines_at(new_lines[skip:])
+        offset = kept + skip - dropped
+        positions.extend(position + offset for position in new_positions)
+        issues.extend(new_issues)
+
+        return {
+            'log_lines': total - dropped,
+            'head': entry['head'],
+            'ends_with_newline': new_lines[-1] == '',
+            'issues': issues,
+            'issue_lines': positions,
+        }
+
+    def _load_analysis_cache(self) -> Dict:
+        """Load the persisted analyze_logs() cache entry."""
+        try:
+            entry = _json_loads(self.analysis_cache_file.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        for issue in entry.get('issues', ()):
+            issue['type'] = _ISSUE_TYPES.get(issue['type'], issue['type'])
+        return entry
+
+    def _save_analysis_cache(self, entry: Dict):
+        """Persist the analyze_logs() cache entry (best effort)."""
+        try:
+            self.analysis_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.analysis_cache_file.with_name(f'{self.analysis_cache_file.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(entry))
+            os.replace(tmp_path, self.analysis_cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write log analysis cache: {e}")
+
+    def analyze_new_logs(self, max_lines: int = 10000) -> Dict:
+        """Analyze only the log lines written since the previous call.
+
+        The read position is checkpointed together with the file's inode, so a
+        rotated or truncated log is scanned from the start. An issue identical
+        to one reported within the last ISSUE_DEDUP_WINDOW seconds is dropped;
+        the report times are kept in the checkpoint too, so this holds across
+        the separate LaunchAgent runs.
+        """
         if not self.log_file.exists():
             return {'log_lines': 0, 'issues': [], 'issues_found': 0}
 
+        checkpoint = self._load_log_checkpoint()
+        with open(self.log_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            offset = checkpoint.get('offset', 0) if checkpoint.get('inode') == st.st_ino else 0
+            if offset > st.st_size:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+        # Leave a partially written last line for the next call
+        consumed = data.rfind(b'\n') + 1
+        lines = data[:consumed].decode('utf-8', errors='replace').split('\n')[:-1][-max_lines:]
+
+        # Wall-clock time, since the window spans processes; expired entries
+        # are dropped here so the checkpoint only holds the current window
+        now = time.time()
+        recent = {
+            (issue_type, detail): seen
+            for issue_type, detail, seen in checkpoint.get('recent', ())
+            if 0 <= now - seen <= self.ISSUE_DEDUP_WINDOW
+        }
         issues = []
-        log_text = self.log_file.read_text()
-        lines = log_text.split('\n')[-max_lines:]
-
-        for line in lines:
-            timestamp = self._extract_timestamp(line)
-            for pattern, issue_type in self.error_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    issues.append({
-                        'type': issue_type,
-                        'detail': match.group(1).strip() if match.groups() else line,
-                        'timestamp': timestamp or datetime.now().isoformat(),
-                        'full_line': line
-                    })
-                    break
+        for issue in self._scan_lines(lines):
+            key = (issue['type'], issue['detail'])
+            # The window runs from the last report, not the last sighting, so
+            # an issue recurring every run is still reported once per window
+            if key not in recent:
+                issues.append(issue)
+                recent[key] = now
+
+        self._save_log_checkpoint(st.st_ino, offset + consumed, recent)
 
         return {
             'log_lines': len(lines),
@@ -259,6 +854,78 @@ class LogAnalyzer:
             'issues_found': len(issues)
         }
 
+    def _scan_lines(self, lines: List[str]) -> List[Dict]:
+        """Match log lines against the issue patterns (first matching pattern wins)."""
+        return self._scan_lines_at(lines)[1]
+
+    def _scan_lines_at(self, lines: List[str]) -> Tuple[List[int], List[Dict]]:
+        """Like _scan_lines, also returning the index of each issue's line."""
+        positions = []
+        issues = []
+        for position, line in enumerate(lines):
+            match = _LOG_ISSUE_RE.match(line)
+            if match:
+                issue_type = match.lastgroup
+                positions.append(position)
+                issues.append({
+                    'type': _ISSUE_TYPES[issue_type],
+                    'detail': match.group(issue_type).strip(),
+                    'timestamp': self._extract_timestamp(line) or datetime.now().isoformat(),
+                    'full_line': line
+                })
+        return positions, issues
+
+    def _load_log_checkpoint(self) -> Dict:
+        """Load the incremental analysis checkpoint ({inode, offset, recent})."""
+        try:
+            return json.loads(self.checkpoint_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_log_checkpoint(self, inode: int, offset: int,
+                             recent: Dict[Tuple[str, str], float]):
+        """Persist the incremental analysis checkpoint.
+
+        Args:
+            inode: Inode of the log the offset refers to
+            offset: Byte offset up to which the log has been analyzed
+            recent: Last report time of each (type, detail) within the dedup window
+        """
+        # Replaced atomically, so a killed run never leaves a truncated checkpoint
+        tmp_path = self.checkpoint_file.with_name(f'{self.checkpoint_file.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({
+            'inode': inode,
+            'offset': offset,
+            'recent': [[issue_type, detail, seen] for (issue_type, detail), seen in recent.items()],
+        }))
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def _read_tail_lines(self, max_lines: int) -> List[str]:
+        """Return the last `max_lines` lines of the log, same as split('\\n')[-max_lines:].
+
+        The file is mapped rather than read, so only the tail window is
+        copied and decoded no matter how large the log has grown.
+        """
+        with open(self.log_file, 'rb') as f:
+            return self._tail_lines(f, os.fstat(f.fileno()).st_size, max_lines)
+
+    @staticmethod
+    def _tail_lines(f: BinaryIO, size: int, max_lines: int) -> List[str]:
+        """Return the last `max_lines` lines of the first `size` bytes of `f`."""
+        if size == 0:
+            return ['']
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            end = size
+            for _ in range(max_lines):
+                end = mm.rfind(b'\n', 0, end)
+                if end < 0:
+                    break
+            else:
+                start = end + 1
+            window = mm[start:]
+        return window.decode('utf-8', errors='replace').split('\n')
+
     def diagnose_and_fix(self, issue: Dict, repo_path: Path) -> Dict:
         """Diagnose an issue and attempt automated fix."""
         # Input validation
@@ -402,8 +1069,6 @@ Return JSON array:
 
     def _learn_from_fix(self, issue: Dict, diagnosis: Dict):
         """Store successful fix in pattern library for future reference."""
-        patterns = self._load_patterns()
-
         pattern_entry = {
             'issue_type': issue['type'],
             'pattern': issue['detail'][:200],
@@ -414,16 +1079,19 @@ Return JSON array:
             'timestamp': datetime.now().isoformat()
         }
 
-        # Check if similar pattern exists
-        similar = self._find_similar_pattern(patterns, issue)
-        if similar:
-            similar['success_count'] += 1
-            similar['confidence'] = min(0.99, similar['confidence'] * 1.1)
-            similar['last_seen'] = datetime.now().isoformat()
-        else:
-            patterns.append(pattern_entry)
+        with self._patterns_lock:
+            patterns = self._load_patterns()
+
+            # Check if similar pattern exists
+            similar = self._find_similar_pattern(patterns, issue)
+            if similar:
+                similar['success_count'] += 1
+                similar['confidence'] = min(0.99, similar['confidence'] * 1.1)
+                similar['last_seen'] = datetime.now().isoformat()
+            else:
+                patterns.append(pattern_entry)
 
-        self._save_patterns(patterns)
+            self._save_patterns(patterns)
         logger.info(f"Learned from fix: {issue['type']}")
 
     def _load_patterns(self) -> List[Dict]:
@@ -431,13 +1099,24 @@ Return JSON array:
         if not self.patterns_db.exists():
             return []
         try:
-            return json.loads(self.patterns_db.read_text())
+            patterns = _json_loads(self.patterns_db.read_bytes())
         except json.JSONDecodeError:
             return []
+        for pattern in patterns:
+            issue_type = pattern.get('issue_type')
+            if isinstance(issue_type, str):
+                pattern['issue_type'] = _ISSUE_TYPES.get(issue_type) or sys.intern(issue_type)
+        return patterns
 
     def _save_patterns(self, patterns: List[Dict]):
-        """Save pattern library to disk."""
-        self.patterns_db.write_text(json.dumps(patterns, indent=2))
+        """Save pattern library to disk.
+
+        Written to a temporary file and renamed into place, so a concurrent
+        _load_patterns() never sees a half-written file.
+        """
+        tmp_path = self.patterns_db.with_name(f'{self.patterns_db.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(_json_dumps_pretty(patterns))
+        os.replace(tmp_path, self.patterns_db)
 
     def _store_error_pattern(self, error_response: dict):
         """Store subprocess error in patterns.json for trend analysis.
@@ -445,8 +1124,6 @@ Return JSON array:
         Args:
             error_response: Structured error dict from _create_subprocess_error_response
         """
-        patterns = self._load_patterns()
-
         # Create pattern entry
         error_pattern = {
             'issue_type': 'subprocess_error',
@@ -462,26 +1139,28 @@ Return JSON array:
             }
         }
 
-        patterns.append(error_pattern)
-        self._save_patterns(patterns)
+        with self._patterns_lock:
+            patterns = self._load_patterns()
+            patterns.append(error_pattern)
+            self._save_patterns(patterns)
 
     def _check_pattern_library(self, issue: Dict) -> Optional[Dict]:
         """Check if issue matches known pattern."""
         patterns = self._load_patterns()
+        detail = issue['detail'].lower()
         for pattern in patterns:
             if pattern['issue_type'] == issue['type']:
                 if pattern['confidence'] > 0.7:
-                    detail_sim = self._similarity(pattern['pattern'], issue['detail'])
-                    if detail_sim > 0.8:
+                    if self._similar_enough(pattern['pattern'], detail, 0.8):
                         return pattern
         return None
 
     def _find_similar_pattern(self, patterns: List[Dict], issue: Dict) -> Optional[Dict]:
         """Find similar pattern in existing patterns."""
+        detail = issue['detail'].lower()
         for pattern in patterns:
             if pattern['issue_type'] == issue['type']:
-                detail_sim = self._similarity(pattern['pattern'], issue['detail'])
-                if detail_sim > 0.85:
+                if self._similar_enough(pattern['pattern'], detail, 0.85):
                     return pattern
         return None
 
@@ -497,8 +1176,8 @@ Return JSON array:
         if not self.log_file.exists():
             return ''
 
-        log_text = self.log_file.read_text()
-        return '\n'.join(log_text.split('\n')[-lines:])
+        # Tail the file instead of reading it whole; the result is identical
+        return '\n'.join(self._read_tail_lines(lines))
 
     def save_issues(self, issues: List[Dict]):
         """Save issues to file."""
@@ -507,7 +1186,7 @@ Return JSON array:
         if not isinstance(issues, list):
             raise ValidationError('issues must be a list')
 
-        self.issues_file.write_text(json.dumps(issues, indent=2))
+        self.issues_file.write_bytes(_json_dumps_pretty(issues))
 
     def save_improvements(self, improvements: List[Dict]):
         """Save improvements to file."""
@@ -516,17 +1195,28 @@ Return JSON array:
         if not isinstance(improvements, list):
             raise ValidationError('improvements must be a list')
 
-        self.improvements_file.write_text(json.dumps(improvements, indent=2))
+        self.improvements_file.write_bytes(_json_dumps_pretty(improvements))
 
     def _extract_timestamp(self, line: str) -> Optional[str]:
         """Extract timestamp from log line."""
-        match = re.match(r'^(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})', line)
+        match = _LOG_TIMESTAMP_RE.match(line)
         return match.group(1) if match else None
 
     def _similarity(self, str1: str, str2: str) -> float:
         """Calculate string similarity (simple ratio)."""
         return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
 
+    def _similar_enough(self, pattern: str, detail_lower: str, threshold: float) -> bool:
+        """Check similarity > threshold, rejecting on the cheap upper bounds first.
+
+        `detail_lower` must already be lower-cased so callers comparing one
+        issue against many patterns only lower-case it once.
+        """
+        matcher = SequenceMatcher(None, pattern.lower(), detail_lower)
+        return (matcher.real_quick_ratio() > threshold
+                and matcher.quick_ratio() > threshold
+                and matcher.ratio() > threshold)
+
 
 class SelfAIRunner:
     """Main runner for the planning-first workflow."""
@@ -543,6 +1233,18 @@ class SelfAIRunner:
         self.lock_file = self.data_dir / 'runner.lock'
         self.lock_fd = None
 
+        # Merges into main must not overlap when tests run in parallel
+        self._merge_lock = threading.Lock()
+
+        # Task stats for the current run cycle (None = needs a fresh query)
+        self._stats_cache: Optional[Dict] = None
+
+        # Present while a CLI change's dashboard refresh is pending
+        self.dashboard_dirty_file = self.data_dir / '.dashboard_dirty'
+
+        # Worker pool reused across phases and runs (created lazily)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # Initialize test environment manager for isolated testing
         self.test_env_manager = TestEnvironmentManager(
             repo_path,
@@ -567,48 +1269,117 @@ class SelfAIRunner:
         # Cleanup orphaned worktrees on startup
         self.worktree_manager.prune_orphaned_worktrees()
 
+    def _cached_stats(self) -> Dict:
+        """Get task stats, reusing the last query until a phase changes the queue."""
+        if self._stats_cache is None:
+            self._stats_cache = self.db.get_stats()
+        return self._stats_cache
+
+    def _invalidate_stats(self):
+        """Mark cached stats stale after tasks were added or changed status."""
+        self._stats_cache = None
+
     def _setup_logging(self):
-        """Setup file logging."""
+        """Setup file logging.
+
+        Records are buffered and written in batches (immediately for errors).
+        A runner created again for the same data dir reuses the existing
+        handler instead of stacking a duplicate one.
+        """
         log_dir = self.data_dir / 'logs'
         log_dir.mkdir(parents=True, exist_ok=True)
+        log_path = os.path.abspath(log_dir / 'runner.log')
 
-        handler = logging.FileHandler(log_dir / 'runner.log')
+        for existing in logger.handlers:
+            target = getattr(existing, 'target', existing)
+            if getattr(target, 'baseFilename', None) == log_path:
+                self._log_handler = existing
+                return
+
+        handler = logging.FileHandler(log_path)
         handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
         ))
-        logger.addHandler(handler)
+        self._log_handler = logging.handlers.MemoryHandler(
+            capacity=100, flushLevel=logging.ERROR, target=handler
+        )
+        logger.addHandler(self._log_handler)
         logger.setLevel(logging.INFO)
 
-    def acquire_lock(self) -> bool:
-        """Acquire exclusive lock with stale lock detection."""
+    def acquire_lock(self, _retry: bool = True) -> bool:
+        """Acquire exclusive lock with stale lock detection.
+
+        The lock file only ever appears complete: the PID is written to a
+        private temp file, flock'ed, then hard-linked into place, which fails
+        if a lock file already exists. Other processes therefore never see it
+        empty or unlocked while its owner is alive.
+        """
+        tmp_path = self.lock_file.with_name(f'{self.lock_file.name}.{os.getpid()}.tmp')
+        lock_fd = None
         try:
-            # Check if lock file exists
-            if self.lock_file.exists():
-                # Read existing PID
-                try:
-                    existing_pid = int(self.lock_file.read_text().strip())
-                    if self._is_process_running(existing_pid):
-                        logger.info(f"Another instance (PID {existing_pid}) is running")
-                        return False
-                    else:
-                        logger.warning(f"Detected stale lock from PID {existing_pid}, cleaning up")
-                        self.lock_file.unlink(missing_ok=True)
-                except (ValueError, OSError) as e:
-                    logger.warning(f"Invalid lock file, removing: {e}")
-                    self.lock_file.unlink(missing_ok=True)
-
-            # Acquire lock
-            self.lock_fd = open(self.lock_file, 'w')
-            fcntl.flock(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_fd.write(str(os.getpid()))
-            self.lock_fd.flush()
-            logger.info(f"Lock acquired by PID {os.getpid()}")
+            lock_fd = open(tmp_path, 'w')
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            lock_fd.write(str(os.getpid()))
+            lock_fd.flush()
+            os.link(tmp_path, self.lock_file)
+        except FileExistsError:
+            lock_fd.close()
+            lock_fd = None
+        except OSError as e:
+            if lock_fd:
+                lock_fd.close()
+            logger.info(f"Failed to acquire lock: {e}")
+            return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        if lock_fd is None:
+            if not self._remove_stale_lock() or not _retry:
+                return False
+            return self.acquire_lock(_retry=False)
+
+        self.lock_fd = lock_fd
+        logger.info(f"Lock acquired by PID {os.getpid()}")
+        return True
+
+    def _remove_stale_lock(self) -> bool:
+        """Remove the existing lock file if its owner is gone.
+
+        A live owner holds a flock on the file. The file is only unlinked
+        while this process holds that flock itself and the path still names
+        the same file, so a lock just taken by another process is never
+        removed. Returns True if the lock file is gone.
+        """
+        try:
+            f = open(self.lock_file)
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.info(f"Failed to acquire lock: {e}")
+            return False
+
+        with f:
+            content = f.read().strip()
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                logger.info(f"Another instance (PID {content}) is running")
+                return False
+            try:
+                existing_pid = int(content)
+                if self._is_process_running(existing_pid):
+                    logger.info(f"Another instance (PID {existing_pid}) is running")
+                    return False
+                logger.warning(f"Detected stale lock from PID {existing_pid}, cleaning up")
+            except ValueError as e:
+                logger.warning(f"Invalid lock file, removing: {e}")
+            try:
+                if os.stat(self.lock_file).st_ino != os.fstat(f.fileno()).st_ino:
+                    return False  # Replaced by a new owner meanwhile
+            except FileNotFoundError:
+                return True
+            self.lock_file.unlink(missing_ok=True)
             return True
-        except (IOError, OSError) as e:
-            if self.lock_fd:
-                self.lock_fd.close()
-            logger.info(f"Failed to acquire lock: {e}")
-            return False
 
     def _is_process_running(self, pid: int) -> bool:
         """Check if a process is actually running (not zombie/dead)."""
@@ -627,9 +1398,11 @@ class SelfAIRunner:
         """Release lock."""
         if self.lock_fd:
             try:
+                # Unlink while still holding the flock, so nobody can take the
+                # released file for stale and remove a successor's lock instead
+                self.lock_file.unlink(missing_ok=True)
                 fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
                 self.lock_fd.close()
-                self.lock_file.unlink(missing_ok=True)
             except Exception:
                 pass
 
@@ -652,23 +1425,36 @@ class SelfAIRunner:
         # Filter out already existing improvements
         new_discoveries = engine._filter_existing(discoveries)
 
-        # Add to database
-        added_count = 0
-        for d in new_discoveries:
-            try:
-                self.db.add_discovered(
-                    title=d.title,
-                    description=d.description,
-                    category=d.category.value,
-                    priority=d.priority,
-                    discovery_source=d.category.value,
-                    metadata=d.metadata,
-                    confidence=d.confidence
-                )
-                added_count += 1
-                logger.info(f"Discovered: {d.title} (priority: {d.priority})")
-            except Exception as e:
-                logger.warning(f"Failed to add discovery '{d.title}': {e}")
+        # Add to database in one transaction
+        rows = [
+            {
+                'title': d.title,
+                'description': d.description,
+                'category': d.category.value,
+                'priority': d.priority,
+                'discovery_source': d.category.value,
+                'metadata': d.metadata,
+                'confidence': d.confidence,
+            }
+            for d in new_discoveries
+        ]
+        try:
+            self.db.add_discovered_many(rows)
+            added = new_discoveries
+        except Exception as e:
+            # The batch was rolled back as a whole: add row by row so only
+            # the discoveries that actually fail are skipped
+            logger.warning(f"Batch insert of {len(rows)} discoveries failed, adding one at a time: {e}")
+            added = []
+            for d, row in zip(new_discoveries, rows):
+                try:
+                    self.db.add_discovered(**row)
+                    added.append(d)
+                except Exception as e:
+                    logger.warning(f"Failed to add discovery '{d.title}': {e}")
+        for d in added:
+            logger.info(f"Discovered: {d.title} (priority: {d.priority})")
+        added_count = len(added)
 
         logger.info(f"Discovery complete: {added_count} new improvements found")
         return added_count
@@ -698,7 +1484,8 @@ class SelfAIRunner:
             logger.info("SelfAI Run Started")
             logger.info("=" * 50)
 
-            stats = self.db.get_stats()
+            self._invalidate_stats()
+            stats = self._cached_stats()
             logger.info(f"Stats: {stats}")
 
             tasks_processed = 0
@@ -707,6 +1494,8 @@ class SelfAIRunner:
             if discover:
                 discovered = self._discover_existing_features()
                 logger.info(f"Phase 0: Discovered {discovered} new improvements")
+                if discovered:
+                    self._invalidate_stats()
 
             # Process tasks (single level workflow)
             level = 1
@@ -720,14 +1509,15 @@ class SelfAIRunner:
                     logger.info(f"Resuming stuck task #{task['id']}: {task['title']} (started at {task.get('started_at')})")
                 self._execute_parallel(stuck_tasks)
                 tasks_processed += len(stuck_tasks)
+                self._invalidate_stats()
 
             # PHASE 2: Test tasks that need testing
             testing = self.db.get_features_for_testing_at_level(level, limit=MAX_PARALLEL_TASKS)
             if testing:
                 logger.info(f"Phase 2: Testing {len(testing)} tasks...")
-                for task in testing:
-                    self._run_test(task, level)
-                    tasks_processed += 1
+                self._run_tests_parallel(testing, level)
+                tasks_processed += len(testing)
+                self._invalidate_stats()
 
             # PHASE 3: Execute approved tasks
             approved = self.db.get_features_for_level(level, limit=MAX_PARALLEL_TASKS)
@@ -735,21 +1525,28 @@ class SelfAIRunner:
                 logger.info(f"Phase 3: Executing {len(approved)} approved tasks...")
                 self._execute_parallel(approved)
                 tasks_processed += len(approved)
+                self._invalidate_stats()
 
             # PHASE 4: Generate plans for pending tasks (BY PRIORITY)
             pending = self.db.get_pending_planning_for_level(level, limit=MAX_PARALLEL_TASKS)
             if pending:
                 logger.info(f"Phase 4: Planning {len(pending)} tasks (by priority)...")
+                # Planning always ends in approved or pending, so the active
+                # count cannot change inside this loop: check the limit once
+                can_plan = self.db.can_start_new_task()
                 for task in pending:
                     logger.info(f"Planning task #{task['id']} (priority: {task.get('priority', 50)}): {task['title']}")
-                    if self.db.can_start_new_task():
+                    if can_plan:
                         self._generate_plan(task)
                         tasks_processed += 1
+                self._invalidate_stats()
 
             # Phase 5: Log analysis and self-diagnosis
             logger.info("Phase 5: Running log analysis...")
+            # Make buffered records from this run visible to the analyzer
+            self._log_handler.flush()
             try:
-                analysis = self.log_analyzer.analyze_logs()
+                analysis = self.log_analyzer.analyze_new_logs()
 
                 if analysis['issues_found'] > 0:
                     logger.warning(f"Found {analysis['issues_found']} issues in logs")
@@ -775,9 +1572,10 @@ class SelfAIRunner:
                     if improvements:
                         logger.info(f"Suggested {len(improvements)} improvements")
                         added_count = 0
+                        titles = self.db.get_titles()
                         for imp in improvements:
                             title = imp['title']
-                            if self.db.exists(title):
+                            if self.db.exists(title, titles=titles):
                                 logger.debug(f"Skipping duplicate: {title}")
                             else:
                                 self.db.add(
@@ -787,14 +1585,21 @@ class SelfAIRunner:
                                     imp.get('priority', 50),
                                     'log_analysis'
                                 )
+                                titles.append((title, 'pending'))
                                 added_count += 1
                                 logger.info(f"Added improvement: {title}")
+                        if added_count:
+                            self._invalidate_stats()
                         logger.info(f"Added {added_count}/{len(improvements)} new improvements (rest were duplicates)")
             except Exception as e:
                 logger.error(f"Log analysis failed: {e}")
 
-            # Update dashboard
-            self.update_dashboard()
+            # Update dashboard only when this run changed the queue (any phase
+            # that did work drops the cached stats) or a CLI command deferred
+            # its refresh with --defer-dashboard; otherwise the page is current
+            if (self._stats_cache is None or self.dashboard_dirty_file.exists()
+                    or not (self.data_dir / 'dashboard.html').exists()):
+                self.update_dashboard(stats=self._cached_stats())
 
             duration = time.time() - start_time
             logger.info(f"Run completed: {tasks_processed} tasks in {duration:.1f}s")
@@ -809,6 +1614,8 @@ class SelfAIRunner:
             # Stop monitoring
             self.monitor.stop()
             self.release_lock()
+            self._invalidate_stats()
+            self._log_handler.flush()
 
     def _extract_key_features(self, plan_content: str) -> str:
         """Extract key features from a plan for the optimized summary."""
@@ -819,7 +1626,7 @@ class SelfAIRunner:
             json_end = plan_content.rfind('}') + 1
             if json_start >= 0 and json_end > json_start:
                 json_str = plan_content[json_start:json_end]
-                plan_data = json.loads(json_str)
+                plan_data = _json_loads(json_str)
 
                 # Build summary from key fields
                 parts = []
@@ -873,7 +1680,7 @@ class SelfAIRunner:
         # Get previous level output if advancing from a lower level
         previous_output = ""
         if level > 1:
-            prev_level_name = ['mvp', 'enhanced'][level-2]
+            prev_level_name = _LEVEL_KEYS[level - 1]
             prev_output = task.get(f'{prev_level_name}_output', '')
             if prev_output:
                 previous_output = f"""
@@ -882,9 +1689,7 @@ This feature has completed the {prev_level_name.upper()} level. Build upon this
 {prev_output}
 """
 
-        # Format scope and test criteria
-        scope_list = '\n'.join(f'  - {s}' for s in guidance['scope'])
-        test_list = '\n'.join(f'  - {t}' for t in guidance['test_criteria'])
+        scope_list, test_list = _PLAN_SCOPE_LISTS[level]
 
         prompt = f"""You are planning a {guidance['name']} level implementation for the SelfAI project.
 
@@ -971,6 +1776,18 @@ Be thorough and detailed. This plan will be reviewed by a human before execution
             # Reset to pending for retry
             self.db._update_status(imp_id, 'pending')
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool shared by parallel execution and testing, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_TASKS, thread_name_prefix='selfai')
+        return self._executor
+
+    def close(self):
+        """Shut down the worker pool, waiting for running tasks to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def _execute_parallel(self, tasks: List[Dict]):
         """Execute tasks in parallel with proper exception handling and metrics tracking."""
         logger.info(f"Starting parallel execution of {len(tasks)} tasks in isolated worktrees")
@@ -986,40 +1803,56 @@ Be thorough and detailed. This plan will be reviewed by a human before execution
             'conflicts_auto_resolved': 0
         }
 
-        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TASKS) as executor:
-            futures = {executor.submit(self._execute_task_in_worktree, task, metrics): task for task in tasks}
+        executor = self._get_executor()
+        futures = {executor.submit(self._execute_task_in_worktree, task, metrics): task for task in tasks}
 
-            for future in as_completed(futures):
-                task = futures[future]
-                try:
-                    # CRITICAL: Call result() to propagate exceptions
-                    future.result()
-                    logger.info(f"Task #{task['id']} completed successfully")
-                    metrics['tasks_completed'] += 1
-                except GitOperationError as e:
-                    logger.error(f"Git error for #{task['id']}: {e}")
-                    self.db.mark_failed(task['id'], str(e))
-                    metrics['tasks_failed'] += 1
-                    # Cleanup worktree on failure
-                    self.worktree_manager.cleanup_worktree(task['id'], force=True)
-                    self.db.clear_worktree_info(task['id'])
-                except subprocess.TimeoutExpired:
-                    logger.error(f"Task #{task['id']} timed out")
-                    self.db.mark_failed(task['id'], "Execution timed out")
-                    metrics['tasks_failed'] += 1
-                    self.worktree_manager.cleanup_worktree(task['id'], force=True)
-                    self.db.clear_worktree_info(task['id'])
-                except Exception as e:
-                    logger.error(f"Task #{task['id']} failed: {e}", exc_info=True)
-                    self.db.mark_failed(task['id'], str(e))
-                    metrics['tasks_failed'] += 1
-                    self.worktree_manager.cleanup_worktree(task['id'], force=True)
-                    self.db.clear_worktree_info(task['id'])
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                # CRITICAL: Call result() to propagate exceptions
+                future.result()
+                logger.info(f"Task #{task['id']} completed successfully")
+                metrics['tasks_completed'] += 1
+            except GitOperationError as e:
+                logger.error(f"Git error for #{task['id']}: {e}")
+                self.db.mark_failed(task['id'], str(e))
+                metrics['tasks_failed'] += 1
+                # Cleanup worktree on failure
+                self.worktree_manager.cleanup_worktree(task['id'], force=True)
+                self.db.clear_worktree_info(task['id'])
+            except subprocess.TimeoutExpired:
+                logger.error(f"Task #{task['id']} timed out")
+                self.db.mark_failed(task['id'], "Execution timed out")
+                metrics['tasks_failed'] += 1
+                self.worktree_manager.cleanup_worktree(task['id'], force=True)
+                self.db.clear_worktree_info(task['id'])
+            except Exception as e:
+                logger.error(f"Task #{task['id']} failed: {e}", exc_info=True)
+                self.db.mark_failed(task['id'], str(e))
+                metrics['tasks_failed'] += 1
+                self.worktree_manager.cleanup_worktree(task['id'], force=True)
+                self.db.clear_worktree_info(task['id'])
 
         # Log metrics after execution
         duration = time.time() - start_time
         logger.info(f"Parallel execution complete: {metrics} in {duration:.1f}s")
 
+    def _run_tests_parallel(self, tasks: List[Dict], level: int):
+        """Run level tests for several tasks concurrently in isolated environments.
+
+        Each test blocks on a Claude subprocess, so overlapping them cuts the
+        phase's wall-clock time to roughly that of the slowest test.
+        """
+        executor = self._get_executor()
+        futures = {executor.submit(self._run_test, task, level): task for task in tasks}
+
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Test run failed for #{task['id']}: {e}", exc_info=True)
+
     def _execute_task_in_worktree(self, task: Dict, metrics: Dict):
         """Execute a single task in an isolated worktree.
 
@@ -1157,12 +1990,7 @@ IMPORTANT: Only implement what's in the plan. Do not add extra features.
 
     def _get_test_criteria(self, level: int) -> str:
         """Get test criteria string for a specific level."""
-        guidance = LEVEL_GUIDANCE[level]
-        criteria = '\n'.join(f'  {i+1}. {c}' for i, c in enumerate(guidance['test_criteria']))
-        return f"""
-## {guidance['name']} Test Criteria (Level {level}/3)
-{criteria}
-"""
+        return _TEST_CRITERIA[level]
 
     def _run_test(self, task: Dict, level: int = None):
         """Run tests for a task at a specific level in isolated environment."""
@@ -1173,7 +2001,7 @@ IMPORTANT: Only implement what's in the plan. Do not add extra features.
         if level is None:
             level = task.get('current_level', 1)
 
-        level_test_count_col = {1: 'mvp_test_count', 2: 'enhanced_test_count', 3: 'advanced_test_count'}[level]
+        level_test_count_col = _LEVEL_TEST_COUNT_COLUMNS[level]
         test_count = task.get(level_test_count_col, 0)
         level_name = LEVEL_GUIDANCE[level]['name']
 
@@ -1222,10 +2050,10 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
                     logger.info(f"#{imp_id} advanced to level {level + 1}")
                 else:
                     # All levels complete - merge and push
-                    self._merge_and_push(imp_id, title)
+                    with self._merge_lock:
+                        self._merge_and_push(imp_id, title)
             else:
                 # Mark level test as failed (will retry up to MAX_TEST_ATTEMPTS)
-                level_test_count_col = {1: 'mvp_test_count', 2: 'enhanced_test_count', 3: 'advanced_test_count'}[level]
                 current_count = task.get(level_test_count_col, 0) + 1
 
                 # Update test count
@@ -1304,18 +2132,30 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
             self.db.mark_failed(imp_id, str(e))
             return False
 
-    def update_dashboard(self):
-        """Update the HTML dashboard."""
-        stats = self.db.get_stats()
-        tasks = self.db.get_all()
+    def update_dashboard(self, stats: Optional[Dict] = None):
+        """Update the HTML dashboard.
+
+        Args:
+            stats: Task stats already fetched by the caller; queried when omitted
+        """
+        if stats is None:
+            stats = self.db.get_stats()
+        tasks = self.db.get_dashboard_tasks()
         discovery_stats = self.db.get_discovery_stats()
 
+        dashboard_path = self.data_dir / 'dashboard.html'
+
         # Generate HTML
         html = self._generate_dashboard_html(stats, tasks, discovery_stats)
 
         # Write dashboard
-        dashboard_path = self.data_dir / 'dashboard.html'
         dashboard_path.write_text(html)
+
+        # Settles any refresh deferred by 'add ... --defer-dashboard'
+        try:
+            os.unlink(self.dashboard_dirty_file)
+        except FileNotFoundError:
+            pass
         logger.debug(f"Dashboard updated: {stats}")
 
     def _generate_discovery_stats_html(self, discovery_stats: Dict) -> str:
@@ -1323,61 +2163,35 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
         if not discovery_stats:
             return ''
 
-        # Category icons
-        category_icons = {
-            'security': '🔒',
-            'test_coverage': '🧪',
-            'refactoring': '🔧',
-            'documentation': '📝',
-            'performance': '⚡',
-            'code_quality': '✨'
-        }
-
-        stat_cards = []
-        for category, count in discovery_stats.items():
-            icon = category_icons.get(category, '🔍')
-            display_name = category.replace('_', ' ').title()
-            stat_cards.append(f'''
-            <div class="stat-card" style="background: rgba(123, 44, 191, 0.2);">
-                <div class="value" style="color: #a78bfa">{icon} {count}</div>
-                <div class="label">{display_name}</div>
-            </div>
-            ''')
+        stat_cards = ''.join(
+            _DISCOVERY_CARD_TEMPLATE.substitute(
+                icon=_DISCOVERY_CATEGORY_ICONS.get(category, '🔍'),
+                count=count,
+                name=category.replace('_', ' ').title(),
+            )
+            for category, count in discovery_stats.items()
+        )
 
         return f'''
         <div style="margin: 20px 0;">
             <h3 style="text-align: center; color: #a78bfa; margin-bottom: 10px;">🔍 Discovered Improvements</h3>
             <div class="stats">
-                {''.join(stat_cards)}
+                {stat_cards}
             </div>
         </div>
         '''
 
     def _generate_dashboard_html(self, stats: Dict, tasks: List[Dict], discovery_stats: Dict) -> str:
         """Generate dashboard HTML."""
-        # Get recovery stats
-        recovery_stats = self.db.get_recovery_stats()
-        stuck_count = recovery_stats.get('stuck_count', 0)
-
-        # Status colors
-        status_colors = {
-            'pending': '#6b7280',
-            'planning': '#8b5cf6',
-            'plan_review': '#f59e0b',
-            'approved': '#06b6d4',  # Cyan - ready for execution
-            'in_progress': '#3b82f6',
-            'testing': '#6366f1',
-            'completed': '#22c55e',
-            'failed': '#ef4444',
-            'cancelled': '#dc2626',
-        }
+        # Stuck tasks are the in-progress ones; reuse the caller's stats instead of re-querying
+        stuck_count = stats.get('in_progress', 0)
 
         # Generate task rows and plan data for JavaScript
         rows = []
         plans_data = {}
         for task in tasks:
             status = task.get('status', 'pending')
-            color = status_colors.get(status, '#6b7280')
+            color = _STATUS_COLORS.get(status, '#6b7280')
 
             # Plan content
             plan = task.get('plan_content', '') or ''
@@ -1385,7 +2199,13 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
 
             # Display optimized plan if available, otherwise plan preview
             display_text = optimized if optimized else plan[:100]
-            display_preview = display_text[:80].replace('"', '&quot;').replace('<', '&lt;').replace('\n', ' ')
+            display_preview = display_text[:80].translate(_PREVIEW_ESCAPE)
+            if len(display_text) > 80:
+                preview_suffix = '...'
+            elif display_text:
+                preview_suffix = ''
+            else:
+                preview_suffix = '<em>Pending</em>'
 
             # Store plan data for JavaScript - escape </script> to prevent breaking HTML
             if plan:
@@ -1402,13 +2222,12 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
             # Conflict indicator
             merge_conflicts = task.get('merge_conflicts', '')
             if merge_conflicts:
-                import json as json_lib
                 try:
-                    conflicts = json_lib.loads(merge_conflicts) if isinstance(merge_conflicts, str) else merge_conflicts
+                    conflicts = json.loads(merge_conflicts) if isinstance(merge_conflicts, str) else merge_conflicts
                     conflict_count = len(conflicts) if isinstance(conflicts, list) else 0
                     if conflict_count > 0:
                         worktree_info += f'<br><small style="color: #ef4444;">⚠️ {conflict_count} conflicts</small>'
-                except:
+                except (ValueError, TypeError):
                     pass
 
             # Action buttons based on status
@@ -1422,317 +2241,32 @@ If tests FAIL, respond with: TEST_FAILED followed by the error details
 
             test_info = f"{task.get('test_count', 0)}/{MAX_TEST_ATTEMPTS}" if status in ['failed', 'cancelled', 'testing'] else '-'
 
-            rows.append(f'''
-            <tr class="{status}">
-                <td>{task['id']}</td>
-                <td>{task['title']}{worktree_info}</td>
-                <td><span class="status-badge" style="background: {color}20; color: {color}">{status}</span></td>
-                <td class="plan-cell">{display_preview}{'...' if len(display_text) > 80 else '' if display_text else '<em>Pending</em>'}</td>
-                <td>{test_info}</td>
-                <td>{actions}</td>
-            </tr>
-            ''')
-
-        return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>SelfAI Dashboard</title>
-    <meta http-equiv="refresh" content="30">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            min-height: 100vh;
-            padding: 20px;
-            color: #fff;
-        }}
-        .container {{ max-width: 1400px; margin: 0 auto; }}
-        h1 {{
-            text-align: center;
-            margin-bottom: 20px;
-            background: linear-gradient(90deg, #00d4ff, #7b2cbf);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }}
-        .stats {{
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-            justify-content: center;
-            margin-bottom: 20px;
-        }}
-        .stat-card {{
-            background: rgba(255,255,255,0.1);
-            padding: 15px 25px;
-            border-radius: 10px;
-            text-align: center;
-        }}
-        .stat-card .value {{ font-size: 1.5rem; font-weight: bold; }}
-        .stat-card .label {{ color: #888; font-size: 0.8rem; }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background: rgba(255,255,255,0.05);
-            border-radius: 10px;
-            overflow: hidden;
-        }}
-        th {{ background: rgba(255,255,255,0.1); padding: 12px; text-align: left; }}
-        td {{ padding: 10px 12px; border-bottom: 1px solid rgba(255,255,255,0.05); }}
-        .status-badge {{
-            padding: 4px 10px;
-            border-radius: 12px;
-            font-size: 0.75rem;
-            font-weight: 600;
-        }}
-        .plan-cell {{
-            max-width: 300px;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-            color: #888;
-            font-size: 0.85rem;
-        }}
-        .btn-approve, .btn-feedback, .btn-reenable, .btn-view {{
-            padding: 5px 10px;
-            border: none;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 0.75rem;
-            margin: 2px;
-        }}
-        .btn-approve {{ background: #22c55e; color: white; }}
-        .btn-feedback {{ background: #f59e0b; color: white; }}
-        .btn-reenable {{ background: #6366f1; color: white; }}
-        .btn-view {{ background: #3b82f6; color: white; }}
-        tr.plan_review {{ background: rgba(245, 158, 11, 0.1); }}
-        tr.cancelled {{ background: rgba(220, 38, 38, 0.1); opacity: 0.7; }}
-        tr.completed {{ opacity: 0.6; }}
-
-        /* Modal */
-        .modal {{
-            display: none;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0,0,0,0.8);
-            justify-content: center;
-            align-items: center;
-        }}
-        .modal-content {{
-            background: #1a1a2e;
-            padding: 30px;
-            border-radius: 15px;
-            max-width: 600px;
-            width: 90%;
-        }}
-        .modal-content.wide {{
-            max-width: 90%;
-            max-height: 90vh;
-            overflow-y: auto;
-        }}
-        .plan-content {{
-            background: #16213e;
-            padding: 20px;
-            border-radius: 8px;
-            white-space: pre-wrap;
-            font-family: monospace;
-            font-size: 0.85rem;
-            max-height: 60vh;
-            overflow-y: auto;
-            line-height: 1.5;
-        }}
-        .modal textarea {{
-            width: 100%;
-            height: 150px;
-            margin: 15px 0;
-            padding: 10px;
-            border-radius: 8px;
-            border: 1px solid #333;
-            background: #16213e;
-            color: #fff;
-        }}
-        .modal button {{
-            padding: 10px 20px;
-            margin: 5px;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>SelfAI Dashboard</h1>
-        <p style="text-align: center; color: #888; margin-bottom: 20px;">
-            Planning-First Workflow | Max {MAX_PARALLEL_TASKS} Parallel | {MAX_TEST_ATTEMPTS} Test Attempts
-        </p>
-
-        {'<div class="warning-banner" style="background: rgba(245, 158, 11, 0.2); padding: 15px; border-radius: 8px; margin-bottom: 20px; border-left: 4px solid #f59e0b;">' +
-         f'⚠️ <strong>{stuck_count} stuck in-progress task(s)</strong> detected (may be from crashed processes)' +
-         '<br><small>Will be resumed on next run</small></div>' if stuck_count > 0 else ''}
-
-        <div class="stats">
-            <div class="stat-card">
-                <div class="value" style="color: #f59e0b">{stats.get('plan_review', 0)}</div>
-                <div class="label">Awaiting Review</div>
-            </div>
-            <div class="stat-card">
-                <div class="value" style="color: #10b981">{stats.get('approved', 0)}</div>
-                <div class="label">Approved</div>
-            </div>
-            <div class="stat-card">
-                <div class="value" style="color: #3b82f6">{stats.get('in_progress', 0)}</div>
-                <div class="label">In Progress</div>
-            </div>
-            <div class="stat-card">
-                <div class="value" style="color: #22c55e">{stats.get('completed', 0)}</div>
-                <div class="label">Completed</div>
-            </div>
-            <div class="stat-card">
-                <div class="value" style="color: #dc2626">{stats.get('cancelled', 0)}</div>
-                <div class="label">Cancelled</div>
-            </div>
-            <div class="stat-card">
-                <div class="value" style="color: #f59e0b">{stuck_count}</div>
-                <div class="label">Stuck Tasks</div>
-            </div>
-        </div>
-
-        {self._generate_discovery_stats_html(discovery_stats) if discovery_stats else ''}
-
-        <table>
-            <thead>
-                <tr>
-                    <th>ID</th>
-                    <th>Feature</th>
-                    <th>Status</th>
-                    <th>Key Features</th>
-                    <th>Tests</th>
-                    <th>Actions</th>
-                </tr>
-            </thead>
-            <tbody>
-                {''.join(rows)}
-            </tbody>
-        </table>
-    </div>
-
-    <!-- Feedback Modal -->
-    <div id="feedbackModal" class="modal">
-        <div class="modal-content">
-            <h3>Provide Feedback</h3>
-            <p>Your feedback will be incorporated into a revised plan:</p>
-            <textarea id="feedbackText" placeholder="Describe what changes you want..."></textarea>
-            <button onclick="submitFeedback()" style="background: #f59e0b; color: white;">Submit</button>
-            <button onclick="closeModal()" style="background: #6b7280; color: white;">Cancel</button>
-        </div>
-    </div>
-
-    <!-- Plan Modal -->
-    <div id="planModal" class="modal">
-        <div class="modal-content wide">
-            <h3 id="planTitle">Plan Details</h3>
-            <div id="planContent" class="plan-content"></div>
-            <div style="margin-top: 15px; text-align: right;">
-                <button onclick="closePlanModal()" style="background: #6b7280; color: white;">Close</button>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let currentTaskId = null;
-        const plans = {json.dumps(plans_data)};
-
-        function showToast(msg, isError) {{
-            const toast = document.createElement('div');
-            toast.style.cssText = 'position:fixed;bottom:20px;right:20px;padding:15px 25px;border-radius:8px;color:white;z-index:10000;background:' + (isError ? '#ef4444' : '#22c55e');
-            toast.textContent = msg;
-            document.body.appendChild(toast);
-            setTimeout(() => toast.remove(), 3000);
-        }}
-
-        async function apiCall(endpoint, method, body) {{
-            try {{
-                const response = await fetch(endpoint, {{
-                    method: method,
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: body ? JSON.stringify(body) : undefined
-                }});
-                const data = await response.json();
-                if (data.success) {{
-                    showToast(data.message);
-                    setTimeout(() => location.reload(), 1000);
-                }} else {{
-                    showToast(data.error || 'Request failed', true);
-                }}
-            }} catch (e) {{
-                showToast('Server not running. Start with: python -m selfai serve', true);
-            }}
-        }}
-
-        function showPlan(id) {{
-            const plan = plans[id];
-            const modal = document.getElementById('planModal');
-            const title = document.getElementById('planTitle');
-            const content = document.getElementById('planContent');
-            if (plan && modal && title && content) {{
-                title.textContent = 'Plan for Task #' + id;
-                content.textContent = plan;
-                modal.style.display = 'flex';
-            }} else {{
-                alert('Plan not found for task #' + id);
-            }}
-        }}
-
-        function closePlanModal() {{
-            document.getElementById('planModal').style.display = 'none';
-        }}
-
-        function approvePlan(id) {{
-            if (confirm('Approve plan for task #' + id + '?')) {{
-                apiCall('/api/approve/' + id, 'POST');
-            }}
-        }}
-
-        function showFeedback(id) {{
-            currentTaskId = id;
-            document.getElementById('feedbackModal').style.display = 'flex';
-        }}
-
-        function closeModal() {{
-            document.getElementById('feedbackModal').style.display = 'none';
-        }}
-
-        function submitFeedback() {{
-            const feedback = document.getElementById('feedbackText').value;
-            if (feedback) {{
-                apiCall('/api/feedback/' + currentTaskId, 'POST', {{ feedback: feedback }});
-            }}
-            closeModal();
-        }}
-
-        function reEnable(id) {{
-            const feedback = prompt('Optional feedback for re-enabling task #' + id + ':', '');
-            if (feedback !== null) {{
-                apiCall('/api/reenable/' + id, 'POST', {{ feedback: feedback }});
-            }}
-        }}
-
-        // Close modals when clicking outside
-        document.addEventListener('click', function(e) {{
-            if (e.target.classList.contains('modal')) {{
-                e.target.style.display = 'none';
-            }}
-        }});
-    </script>
-</body>
-</html>'''
-
+            rows.append(_DASHBOARD_ROW_TEMPLATE.substitute(
+                status=status,
+                id=task['id'],
+                title=_escape_title(task['title']),
+                worktree_info=worktree_info,
+                color=color,
+                preview=display_preview,
+                preview_suffix=preview_suffix,
+                test_info=test_info,
+                actions=actions,
+            ))
+
+        return _DASHBOARD_TEMPLATE.substitute(
+            max_parallel=MAX_PARALLEL_TASKS,
+            max_tests=MAX_TEST_ATTEMPTS,
+            stuck_banner=_STUCK_BANNER_TEMPLATE.substitute(stuck_count=stuck_count) if stuck_count > 0 else '',
+            plan_review=stats.get('plan_review', 0),
+            approved=stats.get('approved', 0),
+            in_progress=stats.get('in_progress', 0),
+            completed=stats.get('completed', 0),
+            cancelled=stats.get('cancelled', 0),
+            stuck_count=stuck_count,
+            discovery=self._generate_discovery_stats_html(discovery_stats) if discovery_stats else '',
+            rows=''.join(rows),
+            plans=json.dumps(plans_data),
+        )
 
 def main():
     """CLI entry point."""
@@ -1750,7 +2284,10 @@ def main():
     runner = SelfAIRunner(repo_path)
 
     if args.command == 'run':
-        runner.run()
+        try:
+            runner.run()
+        finally:
+            runner.close()
     elif args.command == 'status':
         stats = runner.db.get_stats()
         print("SelfAI Status:")
@@ -1,8 +1,10 @@
 """HTTP Server for SelfAI Dashboard with API endpoints."""
 import json
+import os
 import urllib.parse
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
+from typing import Dict, Optional
 import logging
 
 from .database import Database
@@ -10,6 +12,22 @@ from .runner import SelfAIRunner
 
 logger = logging.getLogger('selfai')
 
+# Database signature each repo's dashboard file was last rendered from
+_dashboard_signatures: Dict[Path, tuple] = {}
+
+
+def _db_signature(db_path: Path) -> tuple:
+    """Return mtime and size of the database and its WAL; any write changes one of them."""
+    signature = []
+    for path in (db_path, db_path.with_name(db_path.name + '-wal')):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
 class DashboardHandler(BaseHTTPRequestHandler):
     """Handle dashboard requests and API calls."""
 
@@ -46,17 +64,35 @@ class DashboardHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
 
+    def send_file(self, path: Path, content_type: str):
+        """Send a file with sendfile(), without copying it through Python."""
+        with open(path, 'rb') as f:
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            self.wfile.flush()
+            self.connection.sendfile(f)
+
+    def _render_dashboard(self) -> Optional[Path]:
+        """Return the dashboard file, regenerating it only when the database changed."""
+        dashboard_path = self.data_dir / 'dashboard.html'
+        signature = _db_signature(self.db.db_path)
+        if _dashboard_signatures.get(self.repo_path) != signature or not dashboard_path.exists():
+            runner = SelfAIRunner(self.repo_path)
+            runner.update_dashboard()
+            _dashboard_signatures[self.repo_path] = signature
+        return dashboard_path if dashboard_path.exists() else None
+
     def do_GET(self):
         """Handle GET requests."""
         path = urllib.parse.urlparse(self.path).path
 
         if path == '/' or path == '/dashboard':
             # Serve dashboard
-            runner = SelfAIRunner(self.repo_path)
-            runner.update_dashboard()
-            dashboard_path = self.data_dir / 'dashboard.html'
-            if dashboard_path.exists():
-                self.send_html(dashboard_path.read_text())
+            dashboard_path = self._render_dashboard()
+            if dashboard_path is not None:
+                self.send_file(dashboard_path, 'text/html; charset=utf-8')
             else:
                 self.send_json({'error': 'Dashboard not found'}, 404)
 
@@ -101,7 +137,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
             # Approve a plan
             try:
                 task_id = int(path.split('/')[-1])
-                task = self.db.get_by_id(task_id)
+                task = self.db.get_summary(task_id)
                 if not task:
                     self.send_json({'error': 'Task not found'}, 404)
                     return
@@ -126,7 +162,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
                     self.send_json({'error': 'Feedback is required'}, 400)
                     return
 
-                task = self.db.get_by_id(task_id)
+                task = self.db.get_summary(task_id)
                 if not task:
                     self.send_json({'error': 'Task not found'}, 404)
                     return
@@ -143,7 +179,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 task_id = int(path.split('/')[-1])
                 feedback = data.get('feedback', '')
 
-                task = self.db.get_by_id(task_id)
+                task = self.db.get_summary(task_id)
                 if not task:
                     self.send_json({'error': 'Task not found'}, 404)
                     return
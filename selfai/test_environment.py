@@ -18,6 +18,8 @@ import uuid
 from pathlib import Path
 from typing import Dict, Optional
 
+from .database import Database
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,7 +143,6 @@ class TestEnvironment:
         self.db_path = db_dir / 'test.db'
 
         # Create fresh database with schema
-        from selfai.database import Database
         self.database = Database(self.db_path)
 
         logger.info(f"Created isolated database: {self.db_path}")
@@ -1,5 +1,6 @@
 """Git Worktree Manager for isolated parallel task execution."""
 import logging
+import os
 import re
 import shutil
 import subprocess
@@ -265,7 +266,6 @@ Focus on maintaining functionality from both branches.
 """
 
             # Call Claude to resolve conflicts
-            import os
             CLAUDE_CMD = os.environ.get('CLAUDE_CMD', 'claude')
 
             result = subprocess.run(
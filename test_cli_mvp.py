@@ -0,0 +1,96 @@
+"""MVP tests for the selfai command line."""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).parent
+
+
+def run_cli(repo_path: Path, *args: str) -> subprocess.CompletedProcess:
+    """Run `python -m selfai` as a separate process inside repo_path."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get('PYTHONPATH')]))
+    return subprocess.run([sys.executable, '-m', 'selfai', *args], cwd=str(repo_path),
+                          env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_add_writes_dashboard():
+    """Test that `add` renders dashboard.html before the process exits."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = Path(tmpdir) / 'test_repo'
+        # get_repo_root() treats a directory containing selfai/ as the repo
+        (repo_path / 'selfai').mkdir(parents=True)
+
+        result = run_cli(repo_path, 'add', 'Add retry logic')
+
+        assert result.returncode == 0, result.stderr
+        assert 'Warning' not in result.stdout, result.stdout
+        dashboard = repo_path / '.selfai_data' / 'dashboard.html'
+        assert dashboard.exists(), "dashboard.html should be written by the add command"
+        assert 'Add retry logic' in dashboard.read_text()
+
+    print("✓ test_add_writes_dashboard passed")
+
+
+def test_add_no_dashboard_skips_render():
+    """Test that --no-dashboard leaves dashboard.html unwritten."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = Path(tmpdir) / 'test_repo'
+        (repo_path / 'selfai').mkdir(parents=True)
+
+        result = run_cli(repo_path, '--no-dashboard', 'add', 'Add retry logic')
+
+        assert result.returncode == 0, result.stderr
+        assert not (repo_path / '.selfai_data' / 'dashboard.html').exists()
+
+    print("✓ test_add_no_dashboard_skips_render passed")
+
+
+def test_defer_dashboard_leaves_sentinel():
+    """Test that --defer-dashboard records a pending refresh instead of rendering."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = Path(tmpdir) / 'test_repo'
+        (repo_path / 'selfai').mkdir(parents=True)
+
+        result = run_cli(repo_path, '--defer-dashboard', 'add', 'Add retry logic')
+
+        assert result.returncode == 0, result.stderr
+        assert (repo_path / '.selfai_data' / '.dashboard_dirty').exists()
+        assert not (repo_path / '.selfai_data' / 'dashboard.html').exists()
+
+    print("✓ test_defer_dashboard_leaves_sentinel passed")
+
+
+def test_idle_run_renders_only_deferred_dashboard():
+    """Test that a run with no work re-renders the dashboard only when a refresh is pending."""
+    from selfai.runner import SelfAIRunner
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = Path(tmpdir) / 'test_repo'
+        repo_path.mkdir()
+        runner = SelfAIRunner(repo_path)
+        dashboard = runner.data_dir / 'dashboard.html'
+
+        runner.run()
+        assert dashboard.exists(), "First run should render the missing dashboard"
+
+        dashboard.write_text('stale')
+        runner.run()
+        assert dashboard.read_text() == 'stale', "Idle run should leave the dashboard alone"
+
+        runner.dashboard_dirty_file.touch()
+        runner.run()
+        assert dashboard.read_text() != 'stale', "Deferred refresh should be rendered"
+        assert not runner.dashboard_dirty_file.exists()
+
+    print("✓ test_idle_run_renders_only_deferred_dashboard passed")
+
+
+if __name__ == '__main__':
+    test_add_writes_dashboard()
+    test_add_no_dashboard_skips_render()
+    test_defer_dashboard_leaves_sentinel()
+    test_idle_run_renders_only_deferred_dashboard()
+    print("\n✓ All CLI MVP tests passed!")
@@ -0,0 +1,53 @@
+"""MVP tests for extracting JSON from Claude CLI output."""
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from selfai.runner import _extract_json_from_output
+
+
+def test_array_inside_prose():
+    """Test that an array of objects wrapped in prose is returned whole."""
+    output = 'Here are the improvements: [{"title":"a"},{"title":"b"}]'
+
+    assert _extract_json_from_output(output) == [{'title': 'a'}, {'title': 'b'}]
+
+    print("✓ test_array_inside_prose passed")
+
+
+def test_object_inside_prose():
+    """Test that an object containing an array is returned as the object."""
+    output = 'Diagnosis follows {"issues": [1, 2], "fix": "retry"} as requested'
+
+    assert _extract_json_from_output(output) == {'issues': [1, 2], 'fix': 'retry'}
+
+    print("✓ test_object_inside_prose passed")
+
+
+def test_fenced_array():
+    """Test that an array inside a ```json block is returned."""
+    output = 'Sure!\n```json\n[{"title": "a"}]\n```\nDone.'
+
+    assert _extract_json_from_output(output) == [{'title': 'a'}]
+
+    print("✓ test_fenced_array passed")
+
+
+def test_bracketed_tokens_before_object():
+    """Test that bracketed non-object values in prose don't shadow the real object."""
+    assert _extract_json_from_output(
+        'Per finding [1], the fix is {"fix": "retry"}') == {'fix': 'retry'}
+    assert _extract_json_from_output(
+        'Checked ["a.py"] then {"ok": true}') == {'ok': True}
+
+    print("✓ test_bracketed_tokens_before_object passed")
+
+
+if __name__ == '__main__':
+    test_array_inside_prose()
+    test_object_inside_prose()
+    test_fenced_array()
+    test_bracketed_tokens_before_object()
+    print("\n✓ All JSON extraction MVP tests passed!")
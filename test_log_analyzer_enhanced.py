@@ -5,7 +5,10 @@ Tests input validation, edge cases, and error handling.
 import tempfile
 import shutil
 import json
+import os
+import time
 from pathlib import Path
+from unittest.mock import patch
 from selfai.runner import LogAnalyzer, ValidationError
 
 
@@ -474,6 +477,177 @@ def test_save_improvements_corrupted_existing_file():
         shutil.rmtree(test_dir, ignore_errors=True)
 
 
+def test_analyze_new_logs_incremental():
+    """Test that analyze_new_logs only reports lines added since the last call."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        logs_path = Path(test_dir) / 'logs'
+        logs_path.mkdir()
+        log_file = logs_path / 'runner.log'
+        log_file.write_text('ERROR: first failure\nall good\n')
+
+        analyzer = LogAnalyzer(Path(test_dir), 'claude')
+        first = analyzer.analyze_new_logs()
+
+        with open(log_file, 'a') as f:
+            f.write('ERROR: first failure\nTimeout: second failure\nERROR: partial')
+        second = analyzer.analyze_new_logs()
+
+        if first['issues_found'] != 1:
+            print(f"✗ Expected 1 issue on first scan, got: {first['issues']}")
+            return False
+        if [i['detail'] for i in second['issues']] != ['second failure']:
+            print(f"✗ Expected only the new, non-repeated issue, got: {second['issues']}")
+            return False
+        print("✓ Scans only new complete lines and drops repeated issues")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        return False
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_analyze_logs_cache_extends_on_append():
+    """Test that analyze_logs reuses its on-disk cache and merges appended lines."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        logs_path = Path(test_dir) / 'logs'
+        logs_path.mkdir()
+        log_file = logs_path / 'runner.log'
+        log_file.write_text('ERROR: first failure\nall good\nTimeout: slow\n')
+
+        LogAnalyzer(Path(test_dir), 'claude').analyze_logs(max_lines=3)
+
+        with open(log_file, 'a') as f:
+            f.write('CONFLICT: merge\n')
+        # A fresh analyzer has no in-memory result, so this goes through the disk cache
+        analysis = LogAnalyzer(Path(test_dir), 'claude').analyze_logs(max_lines=3)
+
+        if not (Path(test_dir) / 'cache' / 'log_analysis.json').exists():
+            print("✗ Expected the analysis to be cached on disk")
+            return False
+        if [i['type'] for i in analysis['issues']] != ['timeout', 'conflict']:
+            print(f"✗ Expected issues from the last 3 lines only, got: {analysis['issues']}")
+            return False
+        print("✓ Cached analysis is extended with appended lines")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        return False
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_analyze_logs_ignores_lines_appended_during_scan():
+    """Test that lines appended after the log is measured are scanned exactly once."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        logs_path = Path(test_dir) / 'logs'
+        logs_path.mkdir()
+        log_file = logs_path / 'runner.log'
+        log_file.write_text('2025-01-01 10:00:00 ERROR: first failure while starting the runner\n')
+
+        analyzer = LogAnalyzer(Path(test_dir), 'claude')
+        real_fstat = os.fstat
+
+        def fstat_then_append(fd):
+            # Simulates the runner writing to the log mid-analysis
+            st = real_fstat(fd)
+            with open(log_file, 'a') as f:
+                f.write('Timeout: slow\n')
+            return st
+
+        with patch('selfai.runner.os.fstat', side_effect=fstat_then_append):
+            analyzer.analyze_logs(max_lines=100)
+        analysis = analyzer.analyze_logs(max_lines=100)
+
+        if [i['type'] for i in analysis['issues']] != ['error', 'timeout']:
+            print(f"✗ Expected each issue once, got: {analysis['issues']}")
+            return False
+        if analysis['log_lines'] != 3:
+            print(f"✗ Expected 3 log lines, got: {analysis['log_lines']}")
+            return False
+        print("✓ Lines appended during analysis are picked up once by the next call")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        return False
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_analyze_new_logs_dedup_across_runs():
+    """Test that repeated issues are deduplicated across analyzer instances and expire."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        logs_path = Path(test_dir) / 'logs'
+        logs_path.mkdir()
+        log_file = logs_path / 'runner.log'
+        log_file.write_text('ERROR: first failure\n')
+
+        # Each LaunchAgent run builds a new analyzer
+        LogAnalyzer(Path(test_dir), 'claude').analyze_new_logs()
+        with open(log_file, 'a') as f:
+            f.write('ERROR: first failure\n')
+        repeated = LogAnalyzer(Path(test_dir), 'claude').analyze_new_logs()
+
+        with open(log_file, 'a') as f:
+            f.write('Timeout: other\nERROR: first failure\n')
+        later = time.time() + LogAnalyzer.ISSUE_DEDUP_WINDOW + 1
+        with patch('selfai.runner.time.time', return_value=later):
+            expired = LogAnalyzer(Path(test_dir), 'claude').analyze_new_logs()
+        checkpoint = json.loads((Path(test_dir) / 'log_offset.json').read_text())
+
+        if repeated['issues_found'] != 0:
+            print(f"✗ Expected the repeat to be dropped by a new analyzer, got: {repeated['issues']}")
+            return False
+        if [i['detail'] for i in expired['issues']] != ['other', 'first failure']:
+            print(f"✗ Expected issues to be reported again after the window, got: {expired['issues']}")
+            return False
+        if any(seen < later for _, _, seen in checkpoint['recent']):
+            print(f"✗ Expected expired entries to be pruned, got: {checkpoint['recent']}")
+            return False
+        print("✓ Issue dedup persists across runs and expires")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        return False
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_analyze_new_logs_recurring_issue_reported_each_window():
+    """Test that an issue recurring every run is reported again once the window has passed."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        logs_path = Path(test_dir) / 'logs'
+        logs_path.mkdir()
+        log_file = logs_path / 'runner.log'
+        log_file.touch()
+
+        # The LaunchAgent runs every 180s, inside the 300s dedup window
+        start = time.time()
+        found = []
+        for run in range(5):
+            with open(log_file, 'a') as f:
+                f.write('ERROR: recurring failure\n')
+            with patch('selfai.runner.time.time', return_value=start + 180 * run):
+                found.append(LogAnalyzer(Path(test_dir), 'claude').analyze_new_logs()['issues_found'])
+
+        # Reported at 0s, then at 360s and 720s (each more than 300s after the last report)
+        if found != [1, 0, 1, 0, 1]:
+            print(f"✗ Expected reports once per window, got: {found}")
+            return False
+        print("✓ Recurring issue is reported again after each dedup window")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        return False
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
 def run_all_tests():
     """Run all enhanced tests."""
     tests = [
@@ -494,6 +668,11 @@ def run_all_tests():
         test_save_issues_corrupted_existing_file,
         test_save_improvements_invalid_type,
         test_save_improvements_corrupted_existing_file,
+        test_analyze_new_logs_incremental,
+        test_analyze_new_logs_dedup_across_runs,
+        test_analyze_new_logs_recurring_issue_reported_each_window,
+        test_analyze_logs_cache_extends_on_append,
+        test_analyze_logs_ignores_lines_appended_during_scan,
     ]
 
     print("\n=== Running Enhanced Log Analyzer Tests ===\n")
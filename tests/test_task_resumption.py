@@ -3,6 +3,7 @@ import unittest
 import tempfile
 import shutil
 import os
+import fcntl
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 from selfai.runner import SelfAIRunner
@@ -38,6 +39,15 @@ class TestTaskResumption(unittest.TestCase):
         # Cleanup
         self.runner.release_lock()
 
+    def test_lock_held_by_owner_is_not_removed(self):
+        """Test that a flock'ed lock file is left alone even before its PID is readable."""
+        # Another owner holding the lock, caught before its PID is visible
+        with open(self.runner.lock_file, 'w') as owner:
+            fcntl.flock(owner, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            self.assertFalse(self.runner.acquire_lock())
+            self.assertTrue(self.runner.lock_file.exists())
+
     def test_stuck_tasks_prioritized_first(self):
         """Test that stuck in-progress tasks are processed before pending tasks."""
         # Add stuck task